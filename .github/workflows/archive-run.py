@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Archive one test run into _site/runs/<run_id>/ and write its manifest.
+
+Collects the report, JUnit XML, screenshots, videos, filmstrips,
+per-test metrics and the event log from the results directory in one scan.
+Files are then copied and SHA-256 hashed in a single read, in parallel on a
+thread pool. manifest.json records every archived file with its kind, size,
+hash and the test (and, for screenshots, the step) it belongs to, plus
+per-kind totals. create-index.py reads it instead of re-scanning the run
+directory.
+
+Usage:
+  archive-run.py --dest _site/runs/1234                # results in the current directory
+  archive-run.py --source matrix/dev2 --dest _site/runs/1234-dev2
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+CHUNK = 1024 * 1024
+MANIFEST = "manifest.json"
+
+
+def collect(source):
+    """[(source path, archive path, kind, test)] for everything worth archiving."""
+    src = Path(source)
+    entries = []
+
+    def add(path, dest, kind, test=None):
+        if path.is_file():
+            entries.append((path, dest, kind, test))
+
+    add(src / "report.html", "report.html", "report")
+    add(src / "junit-results.xml", "junit-results.xml", "junit")
+    add(src / "events.jsonl", "events.jsonl", "events")
+    add(src / "events.html", "events.html", "events")
+    for path in sorted((src / "screenshots").rglob("*.png")):
+        add(path, path.relative_to(src).as_posix(), "screenshot")
+    for path in sorted((src / "test-results").rglob("*.webm")):
+        add(path, f"videos/{path.name}", "video", path.stem)
+    for path in sorted((src / "metrics").rglob("*.json")):
+        add(path, path.relative_to(src).as_posix(), "metrics", path.stem)
+    for path in sorted((src / "filmstrips").rglob("*")):
+        test = path.relative_to(src / "filmstrips").parts[0]
+        add(path, path.relative_to(src).as_posix(), "filmstrip", test)
+    return entries
+
+
+def screenshot_owners(source):
+    """{screenshot path relative to ``source``: (test, step)} from the run's event log."""
+    src = Path(source).resolve()
+    events_path = src / "events.jsonl"
+    owners = {}
+    if not events_path.exists():
+        return owners
+    current_step = {}
+    with open(events_path) as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            test = event.get("test")
+            if event.get("type") == "step_start":
+                current_step[test] = event.get("step")
+            elif event.get("type") == "screenshot":
+                # Paths are logged as given to page.screenshot(), relative to the run's cwd
+                path = (src / event.get("path", "")).resolve()
+                if path.is_relative_to(src):
+                    owners[path.relative_to(src).as_posix()] = (test, current_step.get(test))
+    return owners
+
+
+def copy_and_hash(source, dest):
+    """Copy source to dest, hashing the bytes on the way; returns (size, sha256)."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    with open(source, "rb") as fin, open(dest, "wb") as fout:
+        while chunk := fin.read(CHUNK):
+            digest.update(chunk)
+            fout.write(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def archive(source, dest, workers=None):
+    start = time.time()
+    entries = collect(source)
+    owners = screenshot_owners(source)
+    dest = Path(dest)
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+
+    def work(entry):
+        path, rel, kind, test = entry
+        size, sha = copy_and_hash(path, dest / rel)
+        record = {"path": rel, "kind": kind, "size": size, "sha256": sha}
+        if kind == "screenshot" and rel in owners:
+            test, step = owners[rel]
+            if step:
+                record["step"] = step
+        if test:
+            record["test"] = test
+        return record
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        files = list(pool.map(work, entries))
+
+    totals = {}
+    for f in files:
+        t = totals.setdefault(f["kind"], {"files": 0, "bytes": 0})
+        t["files"] += 1
+        t["bytes"] += f["size"]
+    manifest = {
+        "run_id": dest.name,
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "source": str(source),
+        "workers": workers,
+        "elapsed_s": round(time.time() - start, 3),
+        "bytes": sum(f["size"] for f in files),
+        "totals": totals,
+        "files": files,
+    }
+    dest.mkdir(parents=True, exist_ok=True)
+    with open(dest / MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive a test run and write its manifest.")
+    parser.add_argument("--source", default=".", help="directory the tests ran in")
+    parser.add_argument("--dest", required=True, help="run directory, e.g. _site/runs/<run_id>")
+    parser.add_argument("--workers", type=int, help="copy threads (default: 4 per core, max 32)")
+    args = parser.parse_args()
+
+    manifest = archive(args.source, args.dest, args.workers)
+    for kind, t in sorted(manifest["totals"].items()):
+        print(f"Archived {t['files']} {kind} files ({t['bytes'] / 1024 / 1024:.1f} MB)")
+    print(
+        f"{len(manifest['files'])} files, {manifest['bytes'] / 1024 / 1024:.1f} MB in "
+        f"{manifest['elapsed_s']:.2f}s with {manifest['workers']} workers -> {args.dest}/{MANIFEST}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,19 @@ Generate a feature-rich GitHub Pages dashboard for SmartClaim test reports.
 - Trend chart (inline SVG)
 - Per-test pass/fail badges
 - Screenshot gallery with lightbox
-- Video player section
+- Video player section, or screencast filmstrips (CAPTURE_MODE=filmstrip)
 - History table with links to archived runs
+- Frontend performance (navigation timing, paint, long tasks, JS heap)
+- Per-endpoint API latency with diffs against the previous run
+- Document-processing stage latencies per module
+- Runner resource peaks (CPU/RSS of pytest and Chromium processes)
+- Review generation time against input size (scaling benchmark runs)
+- Upload queueing/processing time and throughput against concurrent files
+- Side-by-side pass rates and stage latencies per environment (matrix runs)
+- Archived runs trimmed to a byte budget, cheapest media first
 - Dark mode support
 """
+import functools
 import html
 import json
 import os
@@ -20,7 +29,17 @@ from pathlib import Path
 SITE_DIR = "_site"
 HISTORY_FILE = f"{SITE_DIR}/report-history.json"
 MAX_HISTORY = 30
-MAX_VIDEO_RUNS = 5  # only keep videos for last N runs to save space
+# Archived runs are trimmed to fit this many bytes (GitHub Pages sites are limited to 1 GB)
+SITE_BUDGET = int(float(os.getenv("SITE_BUDGET_MB", "800")) * 1024 * 1024)
+# Media tiers in eviction order: each maps to the manifest kinds it removes
+EVICTION_TIERS = {
+    "videos": ("video", "filmstrip"),
+    "screenshots": ("screenshot",),
+    "reports": ("report", "events"),
+}
+# Directories that only hold a tier's files, removed along with it
+TIER_DIRS = {"videos": ("videos", "filmstrips"), "screenshots": ("screenshots",)}
+DEFAULT_ENVIRONMENT = "default"
 
 
 def load_history():
@@ -46,6 +65,7 @@ def parse_junit_xml(path):
         root = tree.getroot()
         for tc in root.iter("testcase"):
             name = tc.get("name", "unknown")
+            classname = tc.get("classname")
             duration = float(tc.get("time", 0))
             total_duration += duration
             result = "passed"
@@ -61,6 +81,8 @@ def parse_junit_xml(path):
             tests.append(
                 {
                     "name": name,
+                    # Unique across modules/classes; the test scheduler keys on it
+                    "id": f"{classname}::{name}" if classname else name,
                     "result": result,
                     "duration": round(duration, 1),
                     "message": message,
@@ -94,30 +116,347 @@ def parse_report_html_fallback(path):
     return tests
 
 
+@functools.lru_cache(maxsize=None)
+def load_manifest(run_dir):
+    """The run's manifest.json written by archive-run.py, or None."""
+    path = Path(f"{run_dir}/manifest.json")
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return None
+
+
 def catalog_media(run_dir):
+    manifest = load_manifest(run_dir)
+    if manifest is not None:
+        files = manifest.get("files", [])
+        # Relative to screenshots/, which may have subdirectories
+        screenshots = sorted(f["path"].removeprefix("screenshots/") for f in files if f["kind"] == "screenshot")
+        videos = sorted(Path(f["path"]).name for f in files if f["kind"] == "video")
+        return screenshots, videos
+    # Runs archived before manifests existed
     screenshots = sorted(Path(f"{run_dir}/screenshots").glob("*.png")) if Path(f"{run_dir}/screenshots").exists() else []
     videos = sorted(Path(f"{run_dir}/videos").glob("*.webm")) if Path(f"{run_dir}/videos").exists() else []
     return [s.name for s in screenshots], [v.name for v in videos]
 
 
-def cleanup_old_runs(history):
-    """Remove archived runs not in history."""
+def catalog_filmstrips(run_dir):
+    """Per-test filmstrips: name, frame count, size and the last frame as thumbnail."""
+    filmstrips = []
+    manifest = load_manifest(run_dir)
+    if manifest is not None:
+        indexes = sorted(
+            Path(run_dir) / f["path"]
+            for f in manifest.get("files", [])
+            if f["kind"] == "filmstrip" and f["path"].endswith("/filmstrip.json")
+        )
+    else:
+        indexes = sorted(Path(f"{run_dir}/filmstrips").glob("*/filmstrip.json"))
+    for index in indexes:
+        try:
+            with open(index) as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error reading {index}: {e}")
+            continue
+        frames = data.get("frames", [])
+        filmstrips.append(
+            {
+                "name": index.parent.name,
+                "frames": len(frames),
+                "bytes": data.get("bytes", 0),
+                "duration": data.get("duration", 0),
+                "thumb": frames[-1]["file"] if frames else None,
+            }
+        )
+    return filmstrips
+
+
+def load_metrics(run_dir, kind):
+    """Load the run's metrics/<kind>/*.json documents, keyed by test name."""
+    metrics_dir = Path(f"{run_dir}/metrics/{kind}")
+    docs = {}
+    manifest = load_manifest(run_dir)
+    if manifest is not None:
+        paths = sorted(
+            Path(run_dir) / f["path"]
+            for f in manifest.get("files", [])
+            if f["kind"] == "metrics" and Path(f["path"]).parent.name == kind
+        )
+    elif metrics_dir.exists():
+        paths = sorted(metrics_dir.glob("*.json"))
+    else:
+        return docs
+    for path in paths:
+        try:
+            with open(path) as f:
+                docs[path.stem] = json.load(f)
+        except Exception as e:
+            print(f"Error reading {path}: {e}")
+    return docs
+
+
+def median(values):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    mid = len(values) // 2
+    if len(values) % 2:
+        return values[mid]
+    return (values[mid - 1] + values[mid]) / 2
+
+
+def summarize_frontend(docs):
+    """Median frontend metrics per page/interaction label across the run's tests."""
+    by_label = {}
+    for samples in docs.values():
+        for s in samples:
+            by_label.setdefault(s.get("label", "?"), []).append(s)
+
+    summary = {}
+    for label, samples in sorted(by_label.items()):
+        nav = [s.get("navigation") or {} for s in samples]
+        heap = median(s.get("js_heap_used") for s in samples)
+        values = {
+            "duration_ms": median(s.get("duration_ms") for s in samples),
+            "ttfb": median(n.get("ttfb") for n in nav),
+            "dom_content_loaded": median(n.get("dom_content_loaded") for n in nav),
+            "load": median(n.get("load") for n in nav),
+            "fcp": median(s.get("first_contentful_paint") for s in samples),
+            "lcp": median(s.get("largest_contentful_paint") for s in samples),
+            "long_task_ms": median(s.get("long_task_ms") for s in samples),
+            "js_heap_mb": heap / 1024 / 1024 if heap is not None else None,
+        }
+        summary[label] = {k: round(v, 1) for k, v in values.items() if v is not None}
+    return summary
+
+
+def load_network_summary(run_dir):
+    """The run's per-endpoint API latency, as summarised by the test harness."""
+    return load_metrics(run_dir, "network-summary").get("run", {})
+
+
+def summarize_status(docs):
+    """Median time per processing stage (and end to end) for each module."""
+    per_module = {}
+    for timelines in docs.values():
+        for t in timelines:
+            module = per_module.setdefault(t.get("module", "?"), {"stages": {}, "total": [], "outcomes": []})
+            module["total"].append(t.get("total_ms"))
+            module["outcomes"].append(t.get("outcome"))
+            for stage in t.get("stages", []):
+                module["stages"].setdefault(stage["stage"], []).append(stage.get("duration_ms"))
+
+    summary = {}
+    for name, module in sorted(per_module.items()):
+        summary[name] = {
+            "stages": {stage: round(median(v) or 0, 1) for stage, v in module["stages"].items()},
+            "total_ms": round(median(module["total"]) or 0, 1),
+            "uploads": len(module["total"]),
+            "ready": sum(1 for o in module["outcomes"] if o == "ready"),
+        }
+    return summary
+
+
+def summarize_resources(docs):
+    """Per-test CPU/RSS peaks (overall and per process role) and run-level peaks."""
+    tests = {}
+    for name, profile in docs.items():
+        tests[name] = {
+            "peak_cpu": profile.get("peak_cpu", 0),
+            "peak_rss_mb": round(profile.get("peak_rss", 0) / 1024 / 1024, 1),
+            "roles": {
+                role: {
+                    "peak_cpu": r.get("peak_cpu", 0),
+                    "avg_cpu": r.get("avg_cpu", 0),
+                    "peak_rss_mb": round(r.get("peak_rss", 0) / 1024 / 1024, 1),
+                    "io_mb": round((r.get("read_bytes", 0) + r.get("write_bytes", 0)) / 1024 / 1024, 1),
+                }
+                for role, r in profile.get("roles", {}).items()
+            },
+        }
+    if not tests:
+        return {}
+    return {
+        "peak_cpu": max(t["peak_cpu"] for t in tests.values()),
+        "peak_rss_mb": max(t["peak_rss_mb"] for t in tests.values()),
+        "tests": tests,
+    }
+
+
+def summarize_review_scaling(docs):
+    """Seconds to each review section per words-per-textarea benchmark size."""
+    results = sorted(docs.values(), key=lambda r: r.get("words_per_textarea", 0))
+    if not results:
+        return {}
+    sections = {}
+    for r in results:
+        for section, seconds in r.get("sections", {}).items():
+            sections.setdefault(section, {})[str(r["words_per_textarea"])] = seconds
+    return {
+        "sizes": [r["words_per_textarea"] for r in results],
+        "all_sections_s": {str(r["words_per_textarea"]): r.get("all_sections_s") for r in results},
+        "sections": sections,
+    }
+
+
+def summarize_upload_concurrency(docs):
+    """Queueing/processing percentiles and throughput per concurrent-upload run."""
+    runs = sorted(docs.values(), key=lambda r: (r.get("module", ""), r.get("mode", ""), r.get("files", 0)))
+    keys = (
+        "module", "mode", "files", "ready", "queue_p50_s", "queue_max_s",
+        "processing_p50_s", "processing_max_s", "makespan_s", "throughput_per_min",
+    )
+    return [{k: r.get(k) for k in keys} for r in runs]
+
+
+def environment_of(run):
+    return run.get("environment") or DEFAULT_ENVIRONMENT
+
+
+def environment_history(history, environment):
+    """History entries of one environment, newest first."""
+    return [h for h in history if environment_of(h) == environment]
+
+
+def manifest_kind(rel):
+    """Manifest kind of a file in a run directory, as archive-run.py assigns it."""
+    dir_kinds = {
+        "videos": "video",
+        "screenshots": "screenshot",
+        "filmstrips": "filmstrip",
+        "metrics": "metrics",
+    }
+    file_kinds = {
+        "report.html": "report",
+        "junit-results.xml": "junit",
+        "events.jsonl": "events",
+        "events.html": "events",
+    }
+    top = rel.split("/", 1)[0]
+    return dir_kinds.get(top) or file_kinds.get(rel, "other")
+
+
+def write_manifest(run_dir, manifest):
+    with open(f"{run_dir}/manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    load_manifest.cache_clear()
+
+
+def run_manifest(run_dir):
+    """The run's manifest; runs archived without one get it built (once) from a directory walk."""
+    manifest = load_manifest(run_dir)
+    if manifest is not None:
+        return manifest
+    files = []
+    for path in sorted(Path(run_dir).rglob("*")):
+        if path.is_file() and path.name != "manifest.json":
+            rel = path.relative_to(run_dir).as_posix()
+            files.append({"path": rel, "kind": manifest_kind(rel), "size": path.stat().st_size})
+    manifest = {"run_id": Path(run_dir).name, "files": files}
+    update_totals(manifest)
+    write_manifest(run_dir, manifest)
+    return manifest
+
+
+def update_totals(manifest):
+    totals = {}
+    for f in manifest.get("files", []):
+        t = totals.setdefault(f["kind"], {"files": 0, "bytes": 0})
+        t["files"] += 1
+        t["bytes"] += f["size"]
+    manifest["totals"] = totals
+    manifest["bytes"] = sum(t["bytes"] for t in totals.values())
+
+
+def evict_tier(run_dir, manifest, tier):
+    """Delete one media tier of a run and drop it from the manifest; returns bytes freed."""
+    kinds = EVICTION_TIERS[tier]
+    evicted = [f for f in manifest.get("files", []) if f["kind"] in kinds]
+    for f in evicted:
+        try:
+            os.remove(f"{run_dir}/{f['path']}")
+        except OSError:
+            pass
+    for media_dir in TIER_DIRS.get(tier, ()):
+        shutil.rmtree(f"{run_dir}/{media_dir}", ignore_errors=True)
+    manifest["files"] = [f for f in manifest["files"] if f["kind"] not in kinds]
+    manifest["evicted"] = sorted(set(manifest.get("evicted", [])) | {tier})
+    update_totals(manifest)
+    write_manifest(run_dir, manifest)
+    return sum(f["size"] for f in evicted)
+
+
+def cleanup_old_runs(history, budget=SITE_BUDGET):
+    """Remove archived runs not in history, then trim media until the runs fit ``budget`` bytes.
+
+    Sizes come from each run's manifest totals, so the plan is made from
+    (runs x tiers) units rather than individual files. Eviction order:
+    passed runs before failed ones, then oldest run first, downgrading each
+    run fully (videos/filmstrips, then screenshots, then reports) before
+    touching a newer one. Each environment's latest screenshots and report,
+    and every run's JUnit XML and metrics, are never evicted.
+    Returns a summary of what was evicted; history entries are marked too.
+    """
     runs_dir = Path(f"{SITE_DIR}/runs")
+    summary = {"budget": budget, "before": 0, "after": 0, "evicted": []}
     if not runs_dir.exists():
-        return
+        return summary
     keep_ids = {str(h.get("run_id", "")) for h in history}
     for d in runs_dir.iterdir():
         if d.is_dir() and d.name not in keep_ids:
             shutil.rmtree(d, ignore_errors=True)
             print(f"Cleaned up old run: {d.name}")
 
-    # Remove videos from runs older than MAX_VIDEO_RUNS
-    recent_ids = [str(h.get("run_id", "")) for h in history[:MAX_VIDEO_RUNS]]
-    for d in runs_dir.iterdir():
-        if d.is_dir() and d.name not in recent_ids:
-            videos_dir = d / "videos"
-            if videos_dir.exists():
-                shutil.rmtree(videos_dir, ignore_errors=True)
+    manifests = {}
+    for h in history:
+        run_id = str(h.get("run_id", ""))
+        if (runs_dir / run_id).is_dir():
+            manifests[run_id] = run_manifest(str(runs_dir / run_id))
+    total = sum(m.get("bytes", 0) for m in manifests.values())
+    summary["before"] = total
+
+    tier_rank = {tier: i for i, tier in enumerate(EVICTION_TIERS)}
+    units = []
+    latest = set()  # environments whose newest run has been seen
+    protected = ("screenshots", "reports")  # shown for the latest run
+    for age, h in enumerate(history):
+        run_id = str(h.get("run_id", ""))
+        manifest = manifests.get(run_id)
+        newest = environment_of(h) not in latest
+        latest.add(environment_of(h))
+        if manifest is None:
+            continue
+        failed = "fail" in h.get("status", "").lower()
+        for tier, kinds in EVICTION_TIERS.items():
+            if newest and tier in protected:
+                continue
+            size = sum(manifest["totals"].get(kind, {}).get("bytes", 0) for kind in kinds)
+            if size:
+                units.append(((failed, -age, tier_rank[tier]), run_id, tier, size))
+    units.sort()
+
+    for _, run_id, tier, size in units:
+        if total <= budget:
+            break
+        freed = evict_tier(str(runs_dir / run_id), manifests[run_id], tier)
+        total -= freed
+        summary["evicted"].append({"run_id": run_id, "tier": tier, "bytes": freed})
+        print(f"Evicted {tier} of run {run_id} ({format_bytes(freed)})")
+    if total > budget:
+        print(f"Warning: archived runs still use {format_bytes(total)}, over the {format_bytes(budget)} budget")
+
+    for h in history:
+        manifest = manifests.get(str(h.get("run_id", "")))
+        if manifest and manifest.get("evicted"):
+            h["evicted"] = manifest["evicted"]
+    summary["after"] = total
+    print(f"Archived runs: {format_bytes(summary['before'])} -> {format_bytes(total)} (budget {format_bytes(budget)})")
+    return summary
 
 
 def format_duration(seconds):
@@ -174,6 +513,316 @@ def generate_trend_svg(history):
     return svg
 
 
+def generate_line_svg(history, series, unit="ms"):
+    """Inline SVG line chart of per-run values; series maps name -> getter(run)."""
+    runs = list(reversed(history[:MAX_HISTORY]))
+    points = {
+        name: [(i, get(run)) for i, run in enumerate(runs) if get(run) is not None]
+        for name, get in series.items()
+    }
+    points = {name: pts for name, pts in points.items() if pts}
+    if not points:
+        return '<p style="color:var(--text-muted);font-size:13px;">No data yet.</p>'
+
+    w, h = 700, 180
+    pad_left, pad_bottom, pad_top = 50, 30, 10
+    chart_w = w - pad_left - 10
+    chart_h = h - pad_bottom - pad_top
+    n = len(runs)
+    top = max(v for pts in points.values() for _, v in pts) or 1
+    palette = ["var(--blue)", "var(--green)", "var(--red)", "var(--yellow)", "#8b5cf6", "#ec4899", "#14b8a6"]
+
+    def x_of(i):
+        return pad_left + (i * chart_w / (n - 1) if n > 1 else chart_w / 2)
+
+    def y_of(v):
+        return pad_top + chart_h - (v / top * chart_h)
+
+    svg = f'<svg viewBox="0 0 {w} {h}" style="width:100%;max-width:{w}px;height:auto;" xmlns="http://www.w3.org/2000/svg">'
+    for frac in [0, 0.5, 1]:
+        y = y_of(top * frac)
+        svg += f'<line x1="{pad_left}" y1="{y}" x2="{w-10}" y2="{y}" stroke="var(--border)" stroke-dasharray="3,3"/>'
+        svg += f'<text x="{pad_left-5}" y="{y+4}" text-anchor="end" fill="var(--text-muted)" font-size="10">{top * frac:.0f}{unit}</text>'
+    for i, run in enumerate(runs):
+        if n <= 15 or i % max(1, n // 10) == 0:
+            svg += f'<text x="{x_of(i)}" y="{h - 5}" text-anchor="middle" fill="var(--text-muted)" font-size="9">{run.get("date", "")[-5:]}</text>'
+
+    legend = ""
+    for idx, (name, pts) in enumerate(sorted(points.items())):
+        color = palette[idx % len(palette)]
+        path = " ".join(f"{x_of(i):.1f},{y_of(v):.1f}" for i, v in pts)
+        svg += f'<polyline points="{path}" fill="none" stroke="{color}" stroke-width="2"/>'
+        for i, v in pts:
+            svg += f'<circle cx="{x_of(i):.1f}" cy="{y_of(v):.1f}" r="2.5" fill="{color}"><title>{html.escape(name)} {runs[i].get("date", "?")}: {v:.0f}{unit}</title></circle>'
+        legend += f'<span class="legend-item"><span class="dot" style="background:{color}"></span>{html.escape(name)}</span>'
+
+    svg += "</svg>"
+    return f'{svg}<div class="legend">{legend}</div>'
+
+
+def generate_frontend_section(history, current):
+    summary = current.get("frontend") or {}
+    if not summary:
+        return '<p class="text-sm">No frontend metrics captured.</p>'
+
+    chart = generate_line_svg(
+        history,
+        {label: (lambda run, label=label: (run.get("frontend") or {}).get(label, {}).get("duration_ms")) for label in summary},
+    )
+
+    def cell(values, key, fmt="{:.0f}"):
+        return fmt.format(values[key]) if key in values else "-"
+
+    rows = ""
+    for label, values in summary.items():
+        rows += f"""<tr>
+            <td class="mono">{html.escape(label)}</td>
+            <td>{cell(values, "duration_ms")}</td>
+            <td>{cell(values, "ttfb")}</td>
+            <td>{cell(values, "dom_content_loaded")}</td>
+            <td>{cell(values, "fcp")}</td>
+            <td>{cell(values, "lcp")}</td>
+            <td>{cell(values, "long_task_ms")}</td>
+            <td>{cell(values, "js_heap_mb", "{:.1f}")}</td>
+        </tr>"""
+
+    return f"""{chart}
+    <table class="history-table" style="margin-top:12px;">
+        <thead><tr>
+            <th>Page / action</th><th>Duration ms</th><th>TTFB ms</th><th>DCL ms</th><th>FCP ms</th><th>LCP ms</th><th>Long tasks ms</th><th>JS heap MB</th>
+        </tr></thead>
+        <tbody>{rows}</tbody>
+    </table>"""
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f}{unit}"
+        n /= 1024
+    return f"{n:.1f}GB"
+
+
+def generate_network_section(history, current):
+    summary = current.get("network") or {}
+    if not summary:
+        return '<p class="text-sm">No network traffic captured.</p>'
+    previous = next((h.get("network") for h in history[1:] if h.get("network")), {})
+
+    def diff(now, before):
+        if now is None or before is None:
+            return '<span class="text-sm">new</span>' if before is None and now is not None else "-"
+        delta = now - before
+        pct = (delta / before * 100) if before else 0
+        color = "var(--red)" if pct > 20 else "var(--green)" if pct < -20 else "var(--text-muted)"
+        return f'<span style="color:{color}">{delta:+.0f}ms ({pct:+.0f}%)</span>'
+
+    def ms(v):
+        return f"{v:.0f}" if v is not None else "-"
+
+    rows = ""
+    ranked = sorted(summary.items(), key=lambda kv: kv[1].get("p95") or 0, reverse=True)
+    for endpoint, s in ranked:
+        before = previous.get(endpoint, {})
+        errors = f' <span class="badge badge-fail">{s["errors"]} err</span>' if s.get("errors") else ""
+        rows += f"""<tr>
+            <td class="mono">{html.escape(endpoint)}{errors}</td>
+            <td>{s['count']}</td>
+            <td>{ms(s.get('p50'))}</td>
+            <td>{ms(s.get('p95'))}</td>
+            <td>{ms(s.get('max'))}</td>
+            <td>{ms(s.get('ttfb_p50'))}</td>
+            <td>{format_bytes(s.get('bytes', 0))}</td>
+            <td>{diff(s.get('p95'), before.get('p95')) if previous else '-'}</td>
+        </tr>"""
+    gone = sorted(set(previous) - set(summary))
+    footer = f'<p class="text-sm" style="margin-top:6px;">Not called this run: {html.escape(", ".join(gone))}</p>' if gone else ""
+
+    return f"""<table class="history-table">
+        <thead><tr>
+            <th>Endpoint</th><th>Calls</th><th>p50 ms</th><th>p95 ms</th><th>Max ms</th><th>TTFB p50</th><th>Bytes</th><th>p95 vs previous</th>
+        </tr></thead>
+        <tbody>{rows}</tbody>
+    </table>{footer}"""
+
+
+def generate_status_section(history, current):
+    summary = current.get("processing") or {}
+    if not summary:
+        return '<p class="text-sm">No processing timelines captured.</p>'
+
+    chart = generate_line_svg(
+        history,
+        {module: (lambda run, module=module: ((run.get("processing") or {}).get(module) or {}).get("total_ms")) for module in summary},
+    )
+    blocks = ""
+    for module, s in summary.items():
+        stages = s.get("stages", {})
+        slowest = max(stages, key=stages.get) if stages else None
+        rows = ""
+        for stage, ms in stages.items():
+            share = ms / s["total_ms"] * 100 if s.get("total_ms") else 0
+            style = ' style="font-weight:600;color:var(--red)"' if stage == slowest else ""
+            rows += f'<tr><td{style}>{html.escape(stage)}</td><td>{ms / 1000:.1f}s</td><td>{share:.0f}%</td></tr>'
+        blocks += f"""<h3>{html.escape(module.capitalize())} <span class="text-sm">({s.get('ready', 0)}/{s.get('uploads', 0)} ready, {format_duration(s.get('total_ms', 0) / 1000)} end to end)</span></h3>
+        <table class="history-table">
+            <thead><tr><th>Stage</th><th>Median time</th><th>Share</th></tr></thead>
+            <tbody>{rows}</tbody>
+        </table>"""
+    return chart + blocks
+
+
+def generate_resources_section(history, current):
+    summary = current.get("resources") or {}
+    if not summary:
+        return '<p class="text-sm">No resource profile captured.</p>'
+
+    cpu_chart = generate_line_svg(history, {"peak CPU": lambda run: (run.get("resources") or {}).get("peak_cpu")}, unit="%")
+    rss_chart = generate_line_svg(history, {"peak RSS": lambda run: (run.get("resources") or {}).get("peak_rss_mb")}, unit="MB")
+
+    rows = ""
+    for test, t in summary.get("tests", {}).items():
+        roles = sorted(t["roles"].items(), key=lambda kv: kv[1]["peak_cpu"], reverse=True)
+        breakdown = ", ".join(
+            f'{html.escape(role)} {r["peak_cpu"]:.0f}% / {r["peak_rss_mb"]:.0f}MB' for role, r in roles
+        )
+        rows += f"""<tr>
+            <td>{html.escape(test)}</td>
+            <td>{t['peak_cpu']:.0f}%</td>
+            <td>{t['peak_rss_mb']:.0f}MB</td>
+            <td class="text-sm">{breakdown}</td>
+        </tr>"""
+
+    return f"""<div class="summary-grid">
+        <div><h4>Peak CPU</h4>{cpu_chart}</div>
+        <div><h4>Peak RSS</h4>{rss_chart}</div>
+    </div>
+    <table class="history-table" style="margin-top:12px;">
+        <thead><tr><th>Test</th><th>Peak CPU</th><th>Peak RSS</th><th>Per process role (peak CPU / RSS)</th></tr></thead>
+        <tbody>{rows}</tbody>
+    </table>"""
+
+
+def generate_review_scaling_section(current):
+    summary = current.get("review_scaling") or {}
+    if not summary:
+        return ""
+    sizes = [str(w) for w in summary["sizes"]]
+
+    def cell(v):
+        return f"{v:.0f}s" if v is not None else '<span style="color:var(--red)">timeout</span>'
+
+    head = "".join(f"<th>{w} words</th>" for w in sizes)
+    totals = summary.get("all_sections_s", {})
+    rows = "<tr><td><strong>All sections</strong></td>"
+    rows += "".join(f"<td><strong>{cell(totals.get(w))}</strong></td>" for w in sizes) + "</tr>"
+    for section, by_size in summary["sections"].items():
+        rows += f'<tr><td class="mono">{html.escape(section)}</td>'
+        rows += "".join(f"<td>{cell(by_size.get(w))}</td>" for w in sizes) + "</tr>"
+
+    return f"""<!-- Review Scaling -->
+    <div class="card">
+        <h2>Review Scaling (time from Submit by words per textarea)</h2>
+        <table class="history-table">
+            <thead><tr><th>Section</th>{head}</tr></thead>
+            <tbody>{rows}</tbody>
+        </table>
+    </div>"""
+
+
+def generate_upload_concurrency_section(current):
+    runs = current.get("upload_concurrency") or []
+    if not runs:
+        return ""
+
+    def sec(v):
+        return f"{v:.0f}s" if v is not None else "-"
+
+    rows = ""
+    for r in runs:
+        incomplete = r["ready"] != r["files"]
+        ready = f'<span style="color:var(--red)">{r["ready"]}/{r["files"]}</span>' if incomplete else f'{r["ready"]}/{r["files"]}'
+        throughput = f"{r['throughput_per_min']:.1f}" if r.get("throughput_per_min") is not None else "-"
+        rows += f"""<tr>
+            <td>{html.escape(r.get('module') or '')}</td>
+            <td>{html.escape(r.get('mode') or '')}</td>
+            <td>{r['files']}</td>
+            <td>{ready}</td>
+            <td>{sec(r.get('queue_p50_s'))} / {sec(r.get('queue_max_s'))}</td>
+            <td>{sec(r.get('processing_p50_s'))} / {sec(r.get('processing_max_s'))}</td>
+            <td>{sec(r.get('makespan_s'))}</td>
+            <td>{throughput}</td>
+        </tr>"""
+
+    return f"""<!-- Upload Concurrency -->
+    <div class="card">
+        <h2>Concurrent Uploads (time per file by files uploaded at once)</h2>
+        <table class="history-table">
+            <thead><tr>
+                <th>Module</th><th>Mode</th><th>Files</th><th>Ready</th><th>Queue p50 / max</th><th>Processing p50 / max</th><th>Makespan</th><th>Files/min</th>
+            </tr></thead>
+            <tbody>{rows}</tbody>
+        </table>
+    </div>"""
+
+
+def generate_environment_section(history):
+    """Pass rates and stage latencies of each environment's latest run, side by side."""
+    environments = list(dict.fromkeys(environment_of(h) for h in history))
+    if len(environments) < 2:
+        return ""
+    runs = {env: environment_history(history, env) for env in environments}
+    latest = {env: runs[env][0] for env in environments}
+
+    def pass_rate(env):
+        entries = [h for h in runs[env] if h.get("total_tests")]
+        if not entries:
+            return "-"
+        green = sum(1 for h in entries if h.get("status") == "Passed")
+        tests = sum(h.get("passed", 0) for h in entries) / sum(h["total_tests"] for h in entries)
+        return f"{green}/{len(entries)} runs, {tests:.0%} tests"
+
+    def seconds(ms):
+        return f"{ms / 1000:.1f}s" if ms is not None else "-"
+
+    head = "".join(f"<th>{html.escape(env)}</th>" for env in environments)
+    rows = "<tr><td>Latest run</td>"
+    for env in environments:
+        run = latest[env]
+        status = run.get("status", "unknown")
+        s_cls = "passed" if status == "Passed" else "failed" if "fail" in status.lower() else "neutral"
+        rows += f'<td><a href="runs/{run.get("run_id", "")}/report.html"><span class="status-badge {s_cls}">{status}</span></a> <span class="text-sm">{run.get("date", "")}</span></td>'
+    rows += "</tr><tr><td>Pass rate</td>" + "".join(f"<td>{pass_rate(env)}</td>" for env in environments) + "</tr>"
+    rows += "<tr><td>Duration</td>" + "".join(
+        f"<td>{format_duration(latest[env].get('total_duration') or 0)}</td>" for env in environments
+    ) + "</tr>"
+
+    modules = sorted({m for run in latest.values() for m in (run.get("processing") or {})})
+    for module in modules:
+        per_env = {env: (latest[env].get("processing") or {}).get(module, {}) for env in environments}
+        rows += f'<tr><td><strong>{html.escape(module.capitalize())}</strong> end to end</td>'
+        rows += "".join(f"<td><strong>{seconds(per_env[env].get('total_ms'))}</strong></td>" for env in environments) + "</tr>"
+        stages = list(dict.fromkeys(stage for s in per_env.values() for stage in s.get("stages", {})))
+        for stage in stages:
+            values = {env: per_env[env].get("stages", {}).get(stage) for env in environments}
+            known = [v for v in values.values() if v is not None]
+            slowest = max(known) if len(known) > 1 else None
+            rows += f'<tr><td class="text-sm">&nbsp;&nbsp;{html.escape(stage)}</td>'
+            for env in environments:
+                style = ' style="color:var(--red)"' if values[env] is not None and values[env] == slowest else ""
+                rows += f"<td{style}>{seconds(values[env])}</td>"
+            rows += "</tr>"
+
+    return f"""<!-- Environments -->
+    <div class="card">
+        <h2>Environments</h2>
+        <table class="history-table">
+            <thead><tr><th></th>{head}</tr></thead>
+            <tbody>{rows}</tbody>
+        </table>
+    </div>"""
+
+
 def generate_test_badges(tests):
     if not tests:
         return '<span style="color:var(--text-muted);font-size:12px;">No test data</span>'
@@ -230,6 +879,35 @@ def generate_video_section(run_id, videos):
     return html_out
 
 
+def generate_filmstrip_section(run_id, filmstrips):
+    if not filmstrips:
+        return ""
+    html_out = '<div class="video-section"><h3>Test Filmstrips</h3><div class="video-grid">'
+    for f in filmstrips:
+        base = f"runs/{run_id}/filmstrips/{f['name']}"
+        thumb = f'<img src="{base}/{f["thumb"]}" loading="lazy" style="width:100%;border-radius:6px;">' if f["thumb"] else ""
+        html_out += f'''<div class="video-item">
+            <a href="{base}/index.html" target="_blank">{thumb}</a>
+            <span class="video-label">{html.escape(f["name"].replace("_", " "))} &middot; {f["frames"]} frames, {format_duration(f["duration"])}, {format_bytes(f["bytes"])}</span>
+        </div>'''
+    html_out += "</div></div>"
+    return html_out
+
+
+def generate_retention_note(retention):
+    """One line on site size against the byte budget and what this run evicted."""
+    if not retention or not retention.get("budget"):
+        return ""
+    note = f"Archived runs use {format_bytes(retention['after'])} of the {format_bytes(retention['budget'])} budget."
+    evicted = retention.get("evicted", [])
+    if evicted:
+        freed = sum(e["bytes"] for e in evicted)
+        items = ", ".join(f"{e['tier']} of {html.escape(e['run_id'])}" for e in evicted[:10])
+        more = f" and {len(evicted) - 10} more" if len(evicted) > 10 else ""
+        note += f" Evicted {format_bytes(freed)}: {items}{more}."
+    return f'<p class="text-sm" style="margin-top:8px;">{note}</p>'
+
+
 def generate_history_table(history):
     if not history:
         return '<p style="color:var(--text-muted);">No runs recorded yet.</p>'
@@ -237,6 +915,7 @@ def generate_history_table(history):
     repo = os.getenv("GITHUB_REPOSITORY", "")
     server = os.getenv("GITHUB_SERVER_URL", "https://github.com")
 
+    show_environment = len({environment_of(h) for h in history}) > 1
     rows = ""
     for h in history:
         status = h.get("status", "unknown")
@@ -244,7 +923,9 @@ def generate_history_table(history):
         commit = h.get("commit", "?")
         commit_link = f'<a href="{server}/{repo}/commit/{commit}" target="_blank" class="commit-link">{commit[:8]}</a>' if repo and len(commit) > 7 else f'<span class="mono">{commit}</span>'
         run_id = h.get("run_id", "")
-        report_link = f'<a href="runs/{run_id}/report.html" class="btn-sm">View</a>' if run_id else ""
+        report_link = f'<a href="runs/{run_id}/report.html" class="btn-sm">View</a>' if run_id and "reports" not in h.get("evicted", []) else ""
+        if h.get("evicted"):
+            report_link += f'<br><span class="text-sm" title="Evicted to fit the site budget">no {", ".join(h["evicted"])}</span>'
 
         mini_badges = ""
         for t in h.get("tests", []):
@@ -259,6 +940,7 @@ def generate_history_table(history):
             <td><span class="status-badge {s_cls}">{status}</span></td>
             <td>{commit_link}</td>
             <td>{h.get('branch','')}</td>
+            {f"<td>{html.escape(environment_of(h))}</td>" if show_environment else ""}
             <td class="tests-col">{mini_badges}</td>
             <td>{dur}</td>
             <td>{report_link}</td>
@@ -266,18 +948,28 @@ def generate_history_table(history):
 
     return f"""<table class="history-table">
         <thead><tr>
-            <th>Date</th><th>Status</th><th>Commit</th><th>Branch</th><th>Tests</th><th>Duration</th><th>Report</th>
+            <th>Date</th><th>Status</th><th>Commit</th><th>Branch</th>{"<th>Environment</th>" if show_environment else ""}<th>Tests</th><th>Duration</th><th>Report</th>
         </tr></thead>
         <tbody>{rows}</tbody>
     </table>"""
 
 
-def create_index_html(history, current, screenshots, videos):
+def create_index_html(history, current, screenshots, videos, filmstrips=(), retention=None):
     trend_svg = generate_trend_svg(history)
     test_badges = generate_test_badges(current.get("tests", []))
     screenshot_gallery = generate_screenshot_gallery(current.get("run_id", ""), screenshots)
     video_section = generate_video_section(current.get("run_id", ""), videos)
-    history_table = generate_history_table(history)
+    video_section += generate_filmstrip_section(current.get("run_id", ""), filmstrips)
+    history_table = generate_history_table(history) + generate_retention_note(retention)
+    environment_section = generate_environment_section(history)
+    # Latency trends and diffs only compare runs against the same environment
+    same_env = environment_history(history, environment_of(current))
+    frontend_section = generate_frontend_section(same_env, current)
+    network_section = generate_network_section(same_env, current)
+    status_section = generate_status_section(same_env, current)
+    resources_section = generate_resources_section(same_env, current)
+    review_scaling_section = generate_review_scaling_section(current)
+    upload_concurrency_section = generate_upload_concurrency_section(current)
 
     repo = os.getenv("GITHUB_REPOSITORY", "")
     server = os.getenv("GITHUB_SERVER_URL", "https://github.com")
@@ -359,6 +1051,8 @@ body {{ font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-seri
 .stat-box {{ background:var(--bg); border-radius:6px; padding:10px 14px; min-width:80px; text-align:center; }}
 .stat-num {{ font-size:20px; font-weight:700; }}
 .stat-label {{ font-size:10px; color:var(--text-muted); text-transform:uppercase; }}
+.legend {{ display:flex; gap:12px; flex-wrap:wrap; margin-top:6px; font-size:11px; color:var(--text-muted); }}
+.legend-item {{ display:inline-flex; align-items:center; gap:4px; }}
 </style>
 </head>
 <body>
@@ -388,14 +1082,46 @@ body {{ font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-seri
             <div class="summary-item"><span class="summary-label">Date</span><span class="summary-value">{current.get('date','')} {current.get('time','')}</span></div>
             <div class="summary-item"><span class="summary-label">Commit</span><span class="summary-value">{commit_link}</span></div>
             <div class="summary-item"><span class="summary-label">Branch</span><span class="summary-value">{current.get('branch','')}</span></div>
+            <div class="summary-item"><span class="summary-label">Environment</span><span class="summary-value">{html.escape(environment_of(current))}</span></div>
         </div>
         <div style="margin-top:12px;">
             <span class="summary-label">Tests</span><br>
             {test_badges}
         </div>
         <a href="runs/{current.get('run_id','')}/report.html" class="btn-primary">View Full Report</a>
+        {f'<a href="runs/{current.get("run_id","")}/events.html" class="btn-primary">Replay Event Log</a>' if current.get("event_log") else ""}
+    </div>
+
+    {environment_section}
+
+    <!-- Frontend Performance -->
+    <div class="card">
+        <h2>Frontend Performance</h2>
+        {frontend_section}
+    </div>
+
+    <!-- Processing Stages -->
+    <div class="card">
+        <h2>Document Processing Stages</h2>
+        {status_section}
     </div>
 
+    <!-- API Latency -->
+    <div class="card">
+        <h2>API Latency by Endpoint</h2>
+        {network_section}
+    </div>
+
+    <!-- Runner Resources -->
+    <div class="card">
+        <h2>Runner Resources</h2>
+        {resources_section}
+    </div>
+
+    {review_scaling_section}
+
+    {upload_concurrency_section}
+
     <!-- Screenshot Gallery -->
     <div class="card">
         <h2>Screenshots</h2>
@@ -405,7 +1131,7 @@ body {{ font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-seri
     <!-- Videos -->
     <div class="card">
         <h2>Videos</h2>
-        {video_section if video_section else '<p class="text-sm">No videos captured.</p>'}
+        {video_section if video_section else '<p class="text-sm">No videos or filmstrips captured.</p>'}
     </div>
 
     <!-- History -->
@@ -442,11 +1168,9 @@ document.addEventListener('keydown',function(e){{if(e.key==='Escape')closeLightb
     return page
 
 
-def main():
-    history = load_history()
-    run_id = os.getenv("GITHUB_RUN_ID_VAL", str(int(datetime.now().timestamp())))
+def build_run_entry(run_id, environment, env_status, now):
+    """History entry for the run archived in runs/<run_id>."""
     run_dir = f"{SITE_DIR}/runs/{run_id}"
-    now = datetime.utcnow()
 
     # Parse test results
     junit_path = f"{run_dir}/junit-results.xml"
@@ -468,16 +1192,16 @@ def main():
         status = "Passed"
 
     # Override with env var if available
-    env_status = os.getenv("TEST_STATUS", "")
     if env_status == "success" and total > 0:
         status = "Passed"
     elif env_status == "failure" and total > 0:
         status = "Failed"
 
     screenshots, videos = catalog_media(run_dir)
-
-    current = {
+    filmstrips = catalog_filmstrips(run_dir)
+    entry = {
         "run_id": run_id,
+        "environment": environment,
         "timestamp": now.strftime("%Y-%m-%d %H:%M:%S UTC"),
         "date": now.strftime("%Y-%m-%d"),
         "time": now.strftime("%H:%M:%S"),
@@ -491,19 +1215,51 @@ def main():
         "tests": tests,
         "screenshot_count": len(screenshots),
         "video_count": len(videos),
+        "filmstrip_count": len(filmstrips),
+        "event_log": os.path.exists(f"{run_dir}/events.html"),
+        "frontend": summarize_frontend(load_metrics(run_dir, "frontend")),
+        "network": load_network_summary(run_dir),
+        "processing": summarize_status(load_metrics(run_dir, "status")),
+        "resources": summarize_resources(load_metrics(run_dir, "resources")),
+        "review_scaling": summarize_review_scaling(load_metrics(run_dir, "review-scaling")),
+        "upload_concurrency": summarize_upload_concurrency(load_metrics(run_dir, "upload-concurrency")),
     }
+    return entry, screenshots, videos, filmstrips
+
+
+def main():
+    history = load_history()
+    run_id = os.getenv("GITHUB_RUN_ID_VAL", str(int(datetime.now().timestamp())))
+    now = datetime.utcnow()
+
+    # Matrix runs archive each environment as runs/<run_id>-<environment>;
+    # the overall TEST_STATUS doesn't apply to any single one of them.
+    environments = [e.strip() for e in os.getenv("ENVIRONMENTS", "").split(",") if e.strip()]
+    if environments:
+        runs = [(f"{run_id}-{env}", env, "") for env in environments]
+    else:
+        environment = os.getenv("TEST_ENVIRONMENT") or DEFAULT_ENVIRONMENT
+        runs = [(run_id, environment, os.getenv("TEST_STATUS", ""))]
 
-    history.insert(0, current)
+    entries = [build_run_entry(rid, env, env_status, now) for rid, env, env_status in runs]
+    for entry, *_ in reversed(entries):
+        history.insert(0, entry)
     history = history[:MAX_HISTORY]
+    retention = cleanup_old_runs(history)
     save_history(history)
-    cleanup_old_runs(history)
 
-    index_html = create_index_html(history, current, screenshots, videos)
+    current = entries[0][0]
+    # Catalogued again: the byte budget may have evicted some of its media
+    current_dir = f"{SITE_DIR}/runs/{current['run_id']}"
+    screenshots, videos = catalog_media(current_dir)
+    filmstrips = catalog_filmstrips(current_dir)
+    index_html = create_index_html(history, current, screenshots, videos, filmstrips, retention)
     with open(f"{SITE_DIR}/index.html", "w") as f:
         f.write(index_html)
 
-    print(f"Dashboard generated: {total} tests, {passed} passed, {failed} failed")
-    print(f"  Screenshots: {len(screenshots)}, Videos: {len(videos)}")
+    for entry, shots, vids, strips in entries:
+        print(f"Dashboard generated for {entry['environment']}: {entry['total_tests']} tests, {entry['passed']} passed, {entry['failed']} failed")
+        print(f"  Screenshots: {len(shots)}, Videos: {len(vids)}, Filmstrips: {len(strips)}")
     print(f"  History: {len(history)} runs archived")
 
 
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Performance regression gate: compare a run's durations against a baseline.
+
+Reads archived runs from _site/runs/<run_id>/ (JUnit per-test durations and
+metrics/steps/*.json per-step timings), falling back to the test durations
+in report-history.json for runs whose JUnit was pruned. Baselines come from
+runs of the same environment. Each metric of the current run is compared
+with the median of the baseline runs; it counts as a regression only if it
+is slower by more than --threshold (relative) AND --min-delta seconds
+(absolute) AND --mad-k robust deviations (MAD), so one noisy baseline run
+can't trip the gate.
+
+Usage:
+  perf-gate.py                          # current = GITHUB_RUN_ID_VAL or newest, baseline = previous N
+  perf-gate.py --current 1234-staging   # one environment of a matrix run
+  perf-gate.py BASE1 BASE2 ... CURRENT  # explicit runs, last one is compared
+Exits 1 when a regression is found (unless --warn-only).
+"""
+import argparse
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+SITE_DIR = "_site"
+HISTORY_FILE = f"{SITE_DIR}/report-history.json"
+MAD_SCALE = 1.4826  # MAD -> standard deviation for normally distributed noise
+
+
+def load_history(path):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return []
+
+
+def junit_durations(path):
+    """{test: seconds} for tests that passed."""
+    durations = {}
+    if not os.path.exists(path):
+        return durations
+    try:
+        for tc in ET.parse(path).getroot().iter("testcase"):
+            if any(tc.find(tag) is not None for tag in ("failure", "error", "skipped")):
+                continue
+            durations[tc.get("name", "unknown")] = float(tc.get("time", 0))
+    except Exception as e:
+        print(f"Error parsing {path}: {e}", file=sys.stderr)
+    return durations
+
+
+def step_durations(run_dir):
+    """{"test > step[ submodule]": seconds} summed over repeats, passed steps only."""
+    durations = {}
+    for path in sorted(Path(f"{run_dir}/metrics/steps").glob("*.json")):
+        try:
+            with open(path) as f:
+                records = json.load(f)
+        except Exception as e:
+            print(f"Error reading {path}: {e}", file=sys.stderr)
+            continue
+        for r in records:
+            if r.get("status") != "passed":
+                continue
+            key = f"{path.stem} > {r['step']}"
+            if r.get("submodule"):
+                key += f" {r['submodule']}"
+            durations[key] = durations.get(key, 0) + r.get("duration", 0)
+    return durations
+
+
+def run_durations(runs_dir, run_id, history_entry=None):
+    """All comparable durations of one run: tests, then steps."""
+    run_dir = f"{runs_dir}/{run_id}"
+    durations = junit_durations(f"{run_dir}/junit-results.xml")
+    if not durations and history_entry:
+        durations = {
+            t["name"]: t["duration"]
+            for t in history_entry.get("tests", [])
+            if t.get("result") == "passed" and t.get("duration")
+        }
+    durations.update(step_durations(run_dir))
+    return durations
+
+
+def median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+def compare(current, baselines, threshold, min_delta, mad_k, min_samples):
+    """One row per metric of the current run that has enough baseline samples."""
+    rows = []
+    for metric, value in sorted(current.items()):
+        samples = [b[metric] for b in baselines if metric in b]
+        if len(samples) < min_samples:
+            continue
+        base = median(samples)
+        mad = median([abs(s - base) for s in samples]) * MAD_SCALE
+        delta = value - base
+        ratio = delta / base if base else 0
+        score = delta / mad if mad else float("inf") if delta > 0 else 0
+        regression = ratio > threshold and delta > min_delta and score > mad_k
+        improvement = -ratio > threshold and -delta > min_delta
+        rows.append(
+            {
+                "metric": metric,
+                "baseline": base,
+                "mad": mad,
+                "current": value,
+                "delta": delta,
+                "ratio": ratio,
+                "samples": len(samples),
+                "verdict": "REGRESSION" if regression else "improved" if improvement else "ok",
+            }
+        )
+    return rows
+
+
+def format_table(rows):
+    header = f"{'Metric':<60} {'Baseline':>9} {'MAD':>7} {'Current':>9} {'Delta':>9} {'Change':>8} {'n':>3}  Verdict"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['metric'][:60]:<60} {r['baseline']:>8.1f}s {r['mad']:>6.1f}s {r['current']:>8.1f}s "
+            f"{r['delta']:>+8.1f}s {r['ratio']:>+7.0%} {r['samples']:>3}  {r['verdict']}"
+        )
+    return "\n".join(lines)
+
+
+def format_markdown(rows, current_id):
+    lines = [
+        f"### Performance gate for run {current_id}",
+        "",
+        "| Metric | Baseline | Current | Change | Verdict |",
+        "|---|---:|---:|---:|---|",
+    ]
+    for r in rows:
+        if r["verdict"] == "ok":
+            continue
+        lines.append(
+            f"| {r['metric']} | {r['baseline']:.1f}s | {r['current']:.1f}s | {r['ratio']:+.0%} | {r['verdict']} |"
+        )
+    if len(lines) == 4:
+        lines.append("| _no significant changes_ | | | | |")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when a run is slower than its baseline runs.")
+    parser.add_argument("runs", nargs="*", help="explicit run ids: baseline runs followed by the current run")
+    parser.add_argument("--runs-dir", default=f"{SITE_DIR}/runs")
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--current", default=os.getenv("GITHUB_RUN_ID_VAL"), help="run to check (default: newest)")
+    parser.add_argument("--baseline", type=int, default=5, help="number of previous runs to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown that counts (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=5.0, help="ignore slowdowns below this many seconds")
+    parser.add_argument("--mad-k", type=float, default=3.0, help="robust deviations (MAD) a slowdown must exceed")
+    parser.add_argument("--min-samples", type=int, default=2, help="baseline samples needed to judge a metric")
+    parser.add_argument("--warn-only", action="store_true", help="always exit 0")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    entries = {str(h.get("run_id")): h for h in history}
+
+    if len(args.runs) >= 2:
+        current_id, baseline_ids = args.runs[-1], args.runs[:-1]
+    else:
+        current_id = args.runs[0] if args.runs else args.current
+        ordered = [str(h.get("run_id")) for h in history]  # newest first
+        if not current_id:
+            current_id = ordered[0] if ordered else None
+        if not current_id:
+            print("No runs to compare.")
+            return 0
+        environment = entries.get(current_id, {}).get("environment") or "default"
+        ordered = [r for r in ordered if (entries[r].get("environment") or "default") == environment]
+        older = ordered[ordered.index(current_id) + 1 :] if current_id in ordered else ordered
+        baseline_ids = older[: args.baseline]
+
+    current = run_durations(args.runs_dir, current_id, entries.get(current_id))
+    baselines = [run_durations(args.runs_dir, r, entries.get(r)) for r in baseline_ids]
+    baselines = [b for b in baselines if b]
+    if not current or not baselines:
+        print(f"Not enough data to compare run {current_id} ({len(baselines)} baseline runs).")
+        return 0
+
+    rows = compare(current, baselines, args.threshold, args.min_delta, args.mad_k, args.min_samples)
+    print(f"Run {current_id} vs {len(baselines)} baseline runs ({', '.join(baseline_ids)})")
+    print(format_table(rows))
+
+    summary_path = os.getenv("GITHUB_STEP_SUMMARY")
+    if summary_path:
+        with open(summary_path, "a") as f:
+            f.write(format_markdown(rows, current_id))
+
+    regressions = [r for r in rows if r["verdict"] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} / {args.min_delta:.0f}s / {args.mad_k} MAD")
+        return 0 if args.warn_only else 1
+    print("\nNo performance regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
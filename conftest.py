@@ -1,6 +1,80 @@
+import time
+from pathlib import Path
+
 import pytest
 from playwright.sync_api import sync_playwright
 
+from tests import events, frontend_metrics, network_metrics, status_timeline, steps
+from tests.filmstrip import CAPTURE_MODE, Filmstrip, report_html
+from tests.metrics import REPORT_EXTRAS, attach_to_report, safe_name, write_metrics
+from tests.resource_profile import SAMPLE_INTERVAL, ResourceSampler
+
+pytest_plugins = ["tests.scheduling"]
+
+@pytest.fixture(scope="session")
+def event_stream():
+    """Live JSONL (and optional SSE) stream of tests, steps, statuses and screenshots"""
+    stream = events.open_stream()
+    server = None
+    if events.EVENTS_PORT:
+        server = events.serve_events(stream, events.EVENTS_PORT)
+    yield stream
+    if server:
+        server.shutdown()
+    events.close_stream()
+
+@pytest.fixture(autouse=True)
+def test_events(request):
+    """Tag events with the running test; the stream opens with the first browser test"""
+    if "page" not in request.fixturenames:
+        yield
+        return
+    request.getfixturevalue("event_stream")
+    events.set_test(request.node.name)
+    events.publish("test_start")
+    yield
+
+@pytest.fixture(scope="session")
+def resource_sampler():
+    """Sample CPU/RSS/I/O of pytest and its browser processes all session"""
+    if not SAMPLE_INTERVAL or not ResourceSampler.supported():
+        yield None
+        return
+    sampler = ResourceSampler()
+    sampler.start()
+    yield sampler
+    sampler.stop()
+
+@pytest.fixture(autouse=True)
+def resource_profile(request):
+    """Write the test's slice of the resource samples as its profile"""
+    if "page" not in request.fixturenames:
+        # Only browser tests are profiled; unit tests write nothing
+        yield
+        return
+    resource_sampler = request.getfixturevalue("resource_sampler")
+    start = time.time()
+    yield
+    if resource_sampler:
+        # One more sample so short tests and the test's tail are covered.
+        resource_sampler.sample()
+        profile = resource_sampler.profile(start, time.time())
+        write_metrics("resources", request.node.name, profile)
+        attach_to_report(
+            request.node,
+            "Resource profile",
+            {k: v for k, v in profile.items() if k != "timeline"},
+        )
+
+@pytest.fixture(autouse=True)
+def step_timings(request):
+    """Write the flow steps timed during the test"""
+    steps.drain()
+    yield
+    records = steps.drain()
+    if records:
+        write_metrics("steps", request.node.name, records)
+
 @pytest.fixture(scope="session")
 def browser(request):
     """Browser fixture with video recording enabled"""
@@ -12,13 +86,95 @@ def browser(request):
         yield browser
         browser.close()
 
+@pytest.fixture(scope="session")
+def processed_documents(browser):
+    """Upload-and-process cache shared by tests of the same module"""
+    from tests.documents import DocumentCache
+
+    cache = DocumentCache()
+    yield cache
+    if set(cache.files) - cache.kept:
+        context = browser.new_context()
+        try:
+            cache.cleanup(context.new_page())
+        finally:
+            context.close()
+
 @pytest.fixture(scope="function")
-def page(browser):
-    """Page fixture with video recording and screenshot options"""
-    context = browser.new_context(
-        record_video_dir="test-results/",
-        record_video_size={"width": 1280, "height": 720}
-    )
+def page(browser, request):
+    """Page fixture: video or filmstrip, screenshots, frontend/network/status metrics"""
+    if CAPTURE_MODE == "filmstrip":
+        context = browser.new_context()
+    else:
+        context = browser.new_context(
+            record_video_dir="test-results/",
+            record_video_size={"width": 1280, "height": 720}
+        )
+    network = network_metrics.NetworkRecorder(context)
     page = context.new_page()
+    filmstrip = None
+    if CAPTURE_MODE == "filmstrip":
+        filmstrip = Filmstrip(page, request.node.name).start()
+    frontend_metrics.attach(page)
     yield page
-    context.close()
\ No newline at end of file
+    if filmstrip:
+        summary = filmstrip.stop()
+        if summary:
+            strip = report_html(summary, filmstrip.directory)
+            attach_to_report(request.node, "Filmstrip", strip, kind="html")
+    samples = frontend_metrics.detach(page)
+    if samples:
+        write_metrics("frontend", request.node.name, samples)
+        attach_to_report(request.node, "Frontend metrics", samples)
+    timelines = status_timeline.detach(page)
+    if timelines:
+        write_metrics("status", request.node.name, timelines)
+        attach_to_report(request.node, "Processing status timeline", timelines)
+    requests = network.collect()
+    if requests:
+        write_metrics("network", request.node.name, requests)
+        attach_to_report(
+            request.node, "API latency by endpoint", network_metrics.summarize(requests)
+        )
+    context.close()
+    if page.video:
+        # Name the video after the test so the archive can associate them
+        try:
+            video = Path(page.video.path())
+            video.rename(video.with_name(f"{safe_name(request.node.name)}.webm"))
+        except Exception:
+            pass
+
+def pytest_sessionfinish(session):
+    """Write the run-wide API latency summary the dashboard reads."""
+    summary = network_metrics.run_summary()
+    if summary:
+        write_metrics("network-summary", "run", summary)
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Attach collected metrics to the pytest-html report entry."""
+    outcome = yield
+    report = outcome.get_result()
+    ended = report.when == "call" or (report.when == "setup" and not report.passed)
+    if ended and "page" in item.fixturenames:
+        # Named explicitly: a test skipped in setup never ran test_events
+        events.publish(
+            "test_end",
+            test=item.name,
+            outcome=report.outcome,
+            duration=round(report.duration, 3),
+        )
+    pending = item.stash.get(REPORT_EXTRAS, [])
+    if report.when != "teardown" or not pending:
+        return
+    import pytest_html
+
+    extras = getattr(report, "extras", [])
+    for name, data, kind in pending:
+        if kind == "html":
+            extras.append(pytest_html.extras.html(data))
+        else:
+            extras.append(pytest_html.extras.json(data, name=name))
+    report.extras = extras
+    item.stash[REPORT_EXTRAS] = []
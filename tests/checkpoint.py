@@ -0,0 +1,88 @@
+"""Checkpoints of the module flows, so a retry resumes from the failed step.
+
+A checkpoint records what a flow has already achieved: the uploaded file and
+whether it reached Ready, and which submodules generated content. In-process
+retries use it to re-trigger only the failed submodules; with
+``RESUME_CHECKPOINTS=1`` it is also kept on disk across runs, so a rerun of a
+failed test reuses the processed upload instead of uploading and waiting for
+processing again.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", ".checkpoints")
+RESUME_CHECKPOINTS = os.getenv("RESUME_CHECKPOINTS", "") == "1"
+
+
+class Checkpoint:
+    """Progress of one module flow, optionally persisted as JSON."""
+
+    def __init__(self, module: str, persist: bool = RESUME_CHECKPOINTS):
+        self.module = module
+        self.persist = persist
+        self.path = Path(CHECKPOINT_DIR) / f"{module}.json"
+        self.file_id: str | None = None
+        self.file_ready = False
+        self.generated: set[str] = set()
+
+    @classmethod
+    def load(cls, module: str, persist: bool = RESUME_CHECKPOINTS) -> "Checkpoint":
+        """The module's saved checkpoint, or an empty one."""
+        checkpoint = cls(module, persist)
+        if not persist or not checkpoint.path.exists():
+            return checkpoint
+        try:
+            with open(checkpoint.path) as f:
+                data = json.load(f)
+            checkpoint.file_id = data.get("file_id")
+            checkpoint.file_ready = data.get("file_ready", False)
+            checkpoint.generated = set(data.get("generated", []))
+            logger.info(
+                f"Loaded {module} checkpoint: file {checkpoint.file_id} "
+                f"(ready={checkpoint.file_ready}), "
+                f"{len(checkpoint.generated)} submodules generated"
+            )
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {checkpoint.path}: {e}")
+        return checkpoint
+
+    def save(self) -> None:
+        if not self.persist:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(
+                {
+                    "module": self.module,
+                    "file_id": self.file_id,
+                    "file_ready": self.file_ready,
+                    "generated": sorted(self.generated),
+                },
+                f,
+                indent=2,
+            )
+
+    def clear(self) -> None:
+        """Forget all progress, e.g. after the flow succeeded."""
+        self.file_id = None
+        self.file_ready = False
+        self.generated.clear()
+        if self.persist and self.path.exists():
+            self.path.unlink()
+
+    def mark_file(self, file_id: str, ready: bool) -> None:
+        if file_id != self.file_id:
+            # A different upload invalidates everything generated from the old one.
+            self.generated.clear()
+        self.file_id = file_id
+        self.file_ready = ready
+        self.save()
+
+    def mark_generated(self, submodule: str) -> None:
+        self.generated.add(submodule)
+        self.save()
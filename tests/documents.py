@@ -0,0 +1,67 @@
+"""Session-wide cache of uploaded and processed documents, one per module.
+
+Uploading ``output.pdf`` and waiting for it to reach Ready costs minutes, so
+tests of the same module share one processed file. Before handing a cached
+file out, the cache checks that the module still lists it as Ready and
+uploads a fresh one otherwise. The first file of a module comes from the
+flow's checkpoint when it still points at a Ready upload. Every cached file
+is deleted when the session ends, except those a kept checkpoint points to.
+"""
+
+import logging
+
+from tests.run import (
+    cleanup_file,
+    file_is_ready,
+    open_module,
+    upload_and_process,
+    wait_for_files_list,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentCache:
+    """Maps module -> Ready file_id for the test session."""
+
+    def __init__(self):
+        self.files: dict[str, str] = {}
+        self.kept: set[str] = set()
+
+    def get(self, page, module: str, checkpoint=None) -> str:
+        """A Ready file_id in ``module``; ``page`` must be on the module page.
+
+        Without a cached file, ``checkpoint``'s upload is reused if still Ready.
+        """
+        file_id = self.files.get(module)
+        if file_id:
+            if file_is_ready(page, module, file_id):
+                logger.info(f"✓ Reusing processed {module} document {file_id}")
+                return file_id
+            logger.info(f"Cached {module} document {file_id} is no longer Ready")
+            del self.files[module]
+
+        file_id = upload_and_process(page, module, checkpoint)
+        self.files[module] = file_id
+        return file_id
+
+    def keep(self, module: str) -> None:
+        """Leave ``module``'s file in place at session end for a resumed run."""
+        self.kept.add(module)
+
+    def cleanup(self, page) -> None:
+        """Delete every cached file not kept for resume, logging in as needed."""
+        for module, file_id in list(self.files.items()):
+            if module in self.kept:
+                logger.info(f"Keeping {module} document {file_id} for resume")
+                del self.files[module]
+                continue
+            try:
+                open_module(page, module)
+                wait_for_files_list(page)
+                cleanup_file(page, module, file_id)
+            except Exception as e:
+                logger.warning(
+                    f"Could not delete cached {module} document {file_id}: {e}"
+                )
+            del self.files[module]
@@ -0,0 +1,288 @@
+"""Live event stream of a test run.
+
+Test starts/ends, step starts/ends (including every submodule), processing
+status transitions and screenshots are appended to ``EVENTS_FILE`` as JSON
+lines while the run is in progress, so long runs can be followed without
+waiting for the HTML report. With ``EVENTS_PORT`` set, a small server also
+streams them as server-sent events at ``/events`` and serves a viewer page at
+``/`` (plus the screenshots it links to), on ``127.0.0.1`` unless
+``EVENTS_HOST`` says otherwise. The same viewer is written next to
+the JSONL file as ``events.html`` and replays it when opened from the
+archived run.
+
+    EVENTS_PORT=8765 pytest tests/run.py   # then open http://localhost:8765/
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from tests import steps
+
+logger = logging.getLogger(__name__)
+
+EVENTS_FILE = os.getenv("EVENTS_FILE", "events.jsonl")
+EVENTS_PORT = int(os.getenv("EVENTS_PORT", "0"))
+# The log names screenshots, file ids and steps: local-only unless asked otherwise
+EVENTS_HOST = os.getenv("EVENTS_HOST", "127.0.0.1")
+HEARTBEAT = 15  # seconds between SSE keep-alive comments
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>SmartClaim live run</title>
+<style>
+body { font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif; margin:0; padding:16px; font-size:13px; background:#f8f9fb; color:#1a1a2e; }
+h1 { font-size:18px; margin:0 0 12px; }
+#status { color:#6b7280; margin-bottom:12px; }
+table { border-collapse:collapse; width:100%; background:#fff; margin-bottom:16px; }
+th, td { text-align:left; padding:4px 8px; border-bottom:1px solid #e5e7eb; vertical-align:top; }
+th { font-size:11px; text-transform:uppercase; color:#6b7280; }
+.passed { color:#059669; } .failed { color:#dc2626; } .running { color:#2563eb; }
+.stalled td { background:#fef3c7; }
+.mono { font-family:monospace; }
+img { max-width:160px; border:1px solid #e5e7eb; border-radius:4px; }
+</style>
+</head>
+<body>
+<h1>SmartClaim live run</h1>
+<div id="status">Connecting...</div>
+<table><thead><tr><th>Test</th><th>State</th><th>Current step</th><th>Elapsed</th><th>Last event</th></tr></thead><tbody id="tests"></tbody></table>
+<table><thead><tr><th>Time</th><th>Test</th><th>Event</th><th>Details</th></tr></thead><tbody id="log"></tbody></table>
+<script>
+const STALL_SECONDS = 120;
+const tests = {};
+let live = false;
+
+function fmt(s) { s = Math.max(0, Math.round(s)); return s < 60 ? s + 's' : Math.floor(s / 60) + 'm ' + (s % 60) + 's'; }
+function esc(s) { return String(s).replace(/[&<>"]/g, c => ({'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;'}[c])); }
+
+function describe(e) {
+  if (e.type === 'step_start' || e.type === 'step_end') {
+    let d = esc(e.step) + (e.submodule ? ' ' + esc(e.submodule) : '');
+    if (e.type === 'step_end') d += ' <span class="' + esc(e.status) + '">' + esc(e.status) + '</span> in ' + fmt(e.duration);
+    return d;
+  }
+  if (e.type === 'status') return esc(e.module) + ' file ' + esc(e.file_id) + ': ' + esc(e.status);
+  if (e.type === 'screenshot') return '<a href="' + esc(e.path) + '" target="_blank"><img src="' + esc(e.path) + '" loading="lazy"></a>';
+  if (e.type === 'test_end') return '<span class="' + esc(e.outcome) + '">' + esc(e.outcome) + '</span> in ' + fmt(e.duration);
+  return '';
+}
+
+function handle(e) {
+  if (e.test) {
+    const t = tests[e.test] = tests[e.test] || {state: 'running', step: '', start: e.ts, last: e.ts};
+    t.last = e.ts;
+    if (e.type === 'test_start') { t.start = e.ts; t.state = 'running'; }
+    if (e.type === 'step_start') t.step = e.step + (e.submodule ? ' ' + e.submodule : '');
+    if (e.type === 'test_end') { t.state = e.outcome; t.step = ''; t.end = e.ts; }
+  }
+  const row = document.createElement('tr');
+  row.innerHTML = '<td class="mono">' + new Date(e.ts * 1000).toLocaleTimeString() + '</td><td>' + esc(e.test || '') +
+    '</td><td>' + esc(e.type) + '</td><td>' + describe(e) + '</td>';
+  const log = document.getElementById('log');
+  log.insertBefore(row, log.firstChild);
+  while (log.children.length > 500) log.removeChild(log.lastChild);
+}
+
+function render() {
+  const now = Date.now() / 1000;
+  let rows = '';
+  for (const [name, t] of Object.entries(tests)) {
+    const idle = now - t.last;
+    const stalled = live && t.state === 'running' && idle > STALL_SECONDS;
+    rows += '<tr class="' + (stalled ? 'stalled' : '') + '"><td>' + esc(name) + '</td><td class="' + esc(t.state) + '">' + esc(t.state) +
+      '</td><td>' + esc(t.step) + '</td><td>' + fmt((t.end || (live ? now : t.last)) - t.start) +
+      '</td><td>' + (t.state === 'running' && live ? fmt(idle) + ' ago' : '') + '</td></tr>';
+  }
+  document.getElementById('tests').innerHTML = rows;
+}
+
+function replay(text) {
+  text.split('\\n').filter(Boolean).forEach(line => handle(JSON.parse(line)));
+  document.getElementById('status').textContent = 'Replayed ' + Object.keys(tests).length + ' tests from events.jsonl';
+  render();
+}
+
+const source = new EventSource('events');
+source.onopen = () => {
+  // A reconnect replays the whole backlog
+  for (const name in tests) delete tests[name];
+  document.getElementById('log').innerHTML = '';
+};
+source.onmessage = (m) => {
+  live = true;
+  document.getElementById('status').textContent = 'Live';
+  handle(JSON.parse(m.data));
+  render();
+};
+source.onerror = () => {
+  if (live) { document.getElementById('status').textContent = 'Disconnected (run finished?)'; live = false; render(); return; }
+  source.close();
+  fetch('events.jsonl').then(r => r.text()).then(replay)
+    .catch(() => { document.getElementById('status').textContent = 'No events found'; });
+};
+setInterval(render, 1000);
+</script>
+</body>
+</html>
+"""
+
+
+class EventStream:
+    """Append-only JSONL event log that also fans events out to live subscribers."""
+
+    def __init__(self, path: str = EVENTS_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", buffering=1)
+        self._lock = threading.Lock()
+        self._subscribers: list[queue.Queue] = []
+        self.test: str | None = None
+
+    def publish(self, type: str, **fields) -> dict:
+        event = {"ts": round(time.time(), 3), "type": type, "test": self.test, **fields}
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            for q in self._subscribers:
+                q.put(line)
+        return event
+
+    def subscribe(self) -> tuple[list[str], queue.Queue]:
+        """Events so far plus a queue of the ones published from now on."""
+        q: queue.Queue = queue.Queue()
+        with self._lock:
+            self._file.flush()
+            backlog = self.path.read_text().splitlines()
+            self._subscribers.append(q)
+        return backlog, q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def on_step(self, event: str, record: dict) -> None:
+        fields = {
+            k: v
+            for k, v in record.items()
+            if k not in ("step", "start", "status", "duration")
+        }
+        if event == "start":
+            self.publish("step_start", step=record["step"], **fields)
+        else:
+            self.publish(
+                "step_end",
+                step=record["step"],
+                status=record["status"],
+                duration=record["duration"],
+                **fields,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        (self.path.parent / "events.html").write_text(VIEWER_HTML)
+
+
+_stream: EventStream | None = None
+
+
+def open_stream(path: str = EVENTS_FILE) -> EventStream:
+    """Start recording events (and step events) to ``path``."""
+    global _stream
+    _stream = EventStream(path)
+    steps.add_listener(_stream.on_step)
+    return _stream
+
+
+def close_stream() -> None:
+    global _stream
+    if _stream:
+        steps.remove_listener(_stream.on_step)
+        _stream.close()
+        _stream = None
+
+
+def set_test(name: str | None) -> None:
+    """Tag the following events with test ``name``."""
+    if _stream:
+        _stream.test = name
+
+
+def publish(type: str, **fields) -> None:
+    """Publish an event; a no-op when no stream is open (e.g. in the monitor)."""
+    if _stream:
+        _stream.publish(type, **fields)
+
+
+def serve_events(
+    stream: EventStream, port: int, host: str = EVENTS_HOST
+) -> ThreadingHTTPServer:
+    """Serve the viewer, ``/events`` (SSE) and screenshots from a daemon thread."""
+    root = stream.path.parent.resolve()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path in ("/", "/index.html"):
+                self._send(VIEWER_HTML.encode(), "text/html; charset=utf-8")
+            elif path == "/events":
+                self._stream_events()
+            elif path == f"/{stream.path.name}" or path == "/events.jsonl":
+                self._send(stream.path.read_bytes(), "application/x-ndjson")
+            elif path.startswith("/screenshots/") and path.endswith(".png"):
+                file = (root / path.lstrip("/")).resolve()
+                if file.is_relative_to(root / "screenshots") and file.exists():
+                    self._send(file.read_bytes(), "image/png")
+                else:
+                    self.send_error(404)
+            else:
+                self.send_error(404)
+
+        def _send(self, body: bytes, content_type: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream_events(self) -> None:
+            backlog, q = stream.subscribe()
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                for line in backlog:
+                    self.wfile.write(f"data: {line}\n\n".encode())
+                self.wfile.flush()
+                while True:
+                    try:
+                        line = q.get(timeout=HEARTBEAT)
+                        self.wfile.write(f"data: {line}\n\n".encode())
+                    except queue.Empty:
+                        self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                stream.unsubscribe(q)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="events-http", daemon=True
+    ).start()
+    logger.info(f"Live run viewer on http://{host or 'localhost'}:{port}/")
+    return server
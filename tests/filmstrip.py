@@ -0,0 +1,253 @@
+"""Filmstrip capture with the Chrome DevTools screencast.
+
+With ``CAPTURE_MODE=filmstrip`` the page fixture records a filmstrip instead
+of a WebM video. Chromium only emits screencast frames when the page
+repaints; identical frames are dropped, and frames replaced within
+``1 / FILMSTRIP_FPS`` seconds are skipped, so a page that stays put costs
+nothing. A frame is dropped only if the page showed it for less than the
+frame interval.
+
+Each test gets ``filmstrips/<test>/``: numbered JPEGs, ``filmstrip.json``
+(time offset of every frame) and ``index.html``, a timeline viewer with a
+scrubber and playback at the recorded pace.
+"""
+
+import base64
+import hashlib
+import html
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from tests.metrics import safe_name
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODE = os.getenv("CAPTURE_MODE", "video")  # video | filmstrip
+FILMSTRIP_DIR = os.getenv("FILMSTRIP_DIR", "filmstrips")
+FILMSTRIP_FPS = float(os.getenv("FILMSTRIP_FPS", "2"))
+FILMSTRIP_WIDTH = int(os.getenv("FILMSTRIP_WIDTH", "640"))
+FILMSTRIP_HEIGHT = int(os.getenv("FILMSTRIP_HEIGHT", "360"))
+FILMSTRIP_QUALITY = int(os.getenv("FILMSTRIP_QUALITY", "50"))  # JPEG, 0-100
+REPORT_THUMBNAILS = 12
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>Filmstrip: {title}</title>
+<style>
+body {{ font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif; margin:0; padding:16px; font-size:13px; background:#0f172a; color:#e2e8f0; }}
+h1 {{ font-size:16px; margin:0 0 8px; }}
+#frame {{ display:block; max-width:100%; border:1px solid #334155; border-radius:6px; background:#000; }}
+.controls {{ display:flex; align-items:center; gap:10px; margin:10px 0; }}
+.controls input {{ flex:1; }}
+button {{ background:#1e293b; color:#e2e8f0; border:1px solid #334155; border-radius:4px; padding:4px 10px; cursor:pointer; }}
+#time {{ font-family:monospace; min-width:90px; }}
+.strip {{ display:flex; gap:4px; overflow-x:auto; padding-bottom:6px; }}
+.strip figure {{ margin:0; cursor:pointer; opacity:0.6; text-align:center; font-size:10px; color:#94a3b8; }}
+.strip figure.active {{ opacity:1; }}
+.strip img {{ height:60px; border:2px solid transparent; border-radius:3px; display:block; }}
+.strip figure.active img {{ border-color:#60a5fa; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<img id="frame" alt="">
+<div class="controls">
+  <button id="play">&#9654;</button>
+  <input id="scrub" type="range" min="0" value="0">
+  <span id="time"></span>
+</div>
+<div class="strip" id="strip"></div>
+<script>
+const frames = {frames};
+let index = 0, timer = null;
+const strip = document.getElementById('strip');
+const scrub = document.getElementById('scrub');
+scrub.max = Math.max(0, frames.length - 1);
+frames.forEach((f, i) => {{
+  const fig = document.createElement('figure');
+  fig.innerHTML = '<img src="' + f.file + '" loading="lazy"><figcaption>+' + f.t.toFixed(1) + 's</figcaption>';
+  fig.onclick = () => {{ stop(); show(i); }};
+  strip.appendChild(fig);
+}});
+function show(i) {{
+  if (!frames.length) return;
+  index = Math.max(0, Math.min(frames.length - 1, i));
+  document.getElementById('frame').src = frames[index].file;
+  document.getElementById('time').textContent = '+' + frames[index].t.toFixed(2) + 's (' + (index + 1) + '/' + frames.length + ')';
+  scrub.value = index;
+  Array.from(strip.children).forEach((c, j) => c.classList.toggle('active', j === index));
+  strip.children[index].scrollIntoView({{block:'nearest', inline:'nearest'}});
+}}
+function stop() {{ clearTimeout(timer); timer = null; document.getElementById('play').innerHTML = '&#9654;'; }}
+function play() {{
+  if (index >= frames.length - 1) show(0);
+  document.getElementById('play').innerHTML = '&#10074;&#10074;';
+  const next = () => {{
+    if (index >= frames.length - 1) return stop();
+    // Play at the recorded pace, but never sit on one frame for more than 2s
+    const wait = Math.min(2000, (frames[index + 1].t - frames[index].t) * 1000);
+    timer = setTimeout(() => {{ show(index + 1); next(); }}, wait);
+  }};
+  next();
+}}
+document.getElementById('play').onclick = () => timer ? stop() : play();
+scrub.oninput = () => {{ stop(); show(+scrub.value); }};
+document.addEventListener('keydown', (e) => {{
+  if (e.key === 'ArrowRight') {{ stop(); show(index + 1); }}
+  if (e.key === 'ArrowLeft') {{ stop(); show(index - 1); }}
+  if (e.key === ' ') {{ e.preventDefault(); timer ? stop() : play(); }}
+}});
+show(frames.length - 1);
+</script>
+</body>
+</html>
+"""
+
+
+class Filmstrip:
+    """Screencast recorder for one page, writing changed frames to ``directory``."""
+
+    def __init__(
+        self,
+        page,
+        name: str,
+        fps: float = FILMSTRIP_FPS,
+        width: int = FILMSTRIP_WIDTH,
+        height: int = FILMSTRIP_HEIGHT,
+        quality: int = FILMSTRIP_QUALITY,
+    ):
+        self.page = page
+        self.name = name
+        self.directory = Path(FILMSTRIP_DIR) / safe_name(name)
+        self.interval = 1 / fps if fps > 0 else 0
+        self.width = width
+        self.height = height
+        self.quality = quality
+        self.frames: list[dict] = []
+        self.received = 0
+        self.started_at = time.time()
+        self._last_digest: bytes | None = None
+        self._pending: tuple[float, bytes] | None = None
+        self._cdp = None
+
+    def start(self) -> "Filmstrip":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for old in self.directory.glob("*.jpg"):
+            old.unlink()
+        self._cdp = self.page.context.new_cdp_session(self.page)
+        self._cdp.on("Page.screencastFrame", self._on_frame)
+        self._cdp.send(
+            "Page.startScreencast",
+            {
+                "format": "jpeg",
+                "quality": self.quality,
+                "maxWidth": self.width,
+                "maxHeight": self.height,
+            },
+        )
+        self.started_at = time.time()
+        return self
+
+    def _on_frame(self, params: dict) -> None:
+        try:
+            self._cdp.send(
+                "Page.screencastFrameAck", {"sessionId": params["sessionId"]}
+            )
+        except Exception:
+            return  # page closing
+        self.received += 1
+        data = base64.b64decode(params["data"])
+        digest = hashlib.sha1(data).digest()
+        if digest == self._last_digest:
+            return
+        self._last_digest = digest
+        ts = params.get("metadata", {}).get("timestamp") or time.time()
+
+        if self._pending and ts - self._pending[0] >= self.interval:
+            # The pending frame stayed on screen for a full interval: keep it
+            self._write(*self._pending)
+            self._pending = None
+        if not self.frames or ts - self.frames[-1]["ts"] >= self.interval:
+            self._write(ts, data)
+            self._pending = None
+        else:
+            self._pending = (ts, data)
+
+    def _write(self, ts: float, data: bytes) -> None:
+        file_name = f"{len(self.frames) + 1:04d}.jpg"
+        (self.directory / file_name).write_bytes(data)
+        self.frames.append({"ts": ts, "file": file_name, "bytes": len(data)})
+
+    def stop(self) -> dict | None:
+        """Stop recording and write the frame index and viewer; None if no frames."""
+        if self._cdp:
+            try:
+                self._cdp.send("Page.stopScreencast")
+                self._cdp.detach()
+            except Exception:
+                pass
+            self._cdp = None
+        if self._pending:
+            self._write(*self._pending)
+            self._pending = None
+        if not self.frames:
+            return None
+
+        frames = [
+            {
+                "t": round(max(0.0, f["ts"] - self.started_at), 3),
+                "file": f["file"],
+                "bytes": f["bytes"],
+            }
+            for f in self.frames
+        ]
+        summary = {
+            "test": self.name,
+            "frames": frames,
+            "received": self.received,
+            "bytes": sum(f["bytes"] for f in frames),
+            "duration": round(time.time() - self.started_at, 3),
+            "fps": round(1 / self.interval, 2) if self.interval else None,
+            "size": [self.width, self.height],
+            "quality": self.quality,
+        }
+        with open(self.directory / "filmstrip.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        (self.directory / "index.html").write_text(
+            VIEWER_HTML.format(
+                title=html.escape(self.name),
+                frames=json.dumps([{"t": f["t"], "file": f["file"]} for f in frames]),
+            )
+        )
+        logger.info(
+            f"Filmstrip: kept {len(frames)} of {self.received} frames "
+            f"({summary['bytes'] / 1024:.0f}KB) in {self.directory}"
+        )
+        return summary
+
+
+def report_html(summary: dict, directory: Path) -> str:
+    """Strip of evenly spaced thumbnails linking to the viewer, for the HTML report."""
+    frames = summary["frames"]
+    step = max(1, len(frames) // REPORT_THUMBNAILS)
+    picks = frames[::step][: REPORT_THUMBNAILS - 1]
+    if picks[-1] is not frames[-1]:
+        picks.append(frames[-1])
+    base = directory.as_posix()
+    thumbs = "".join(
+        f'<a href="{base}/index.html" target="_blank" title="+{f["t"]:.1f}s">'
+        f'<img src="{base}/{f["file"]}" '
+        'style="height:54px;margin-right:3px;border:1px solid #ccc;"></a>'
+        for f in picks
+    )
+    return (
+        f'<div><p>Filmstrip: {len(frames)} frames over {summary["duration"]:.0f}s, '
+        f'{summary["bytes"] / 1024:.0f}KB '
+        f'(<a href="{base}/index.html" target="_blank">open viewer</a>)</p>'
+        f"{thumbs}</div>"
+    )
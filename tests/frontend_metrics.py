@@ -0,0 +1,164 @@
+"""Frontend performance capture for navigations and major interactions.
+
+The page fixture attaches a :class:`FrontendMetrics` collector to every page.
+Flows wrap navigations in :func:`measure`, which records the wall-clock time
+of the action plus a snapshot of the page's Performance API data (Navigation
+Timing, paint, LCP, long tasks) and Chromium's CDP ``Performance`` counters
+(JS heap, DOM nodes, script/layout time).
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Installed before any page script runs so buffered LCP and long-task entries
+# are observed from the start of every document.
+OBSERVER_SCRIPT = """
+(() => {
+  if (window.__smartclaimPerf) return;
+  const perf = window.__smartclaimPerf = {
+    lcp: null, longTasks: [], cursor: 0, loadReported: false,
+  };
+  const observe = (type, onEntry) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(onEntry))
+        .observe({type, buffered: true});
+    } catch (e) {}
+  };
+  observe('largest-contentful-paint', (e) => {
+    perf.lcp = e.renderTime || e.loadTime || e.startTime;
+  });
+  observe('longtask', (e) => {
+    perf.longTasks.push({start: e.startTime, duration: e.duration});
+  });
+})();
+"""
+
+SNAPSHOT_SCRIPT = """
+() => {
+  const perf = window.__smartclaimPerf || {lcp: null, longTasks: [], cursor: 0};
+  // Load/paint timings belong to the document, not to later client-side route
+  // changes, so only report them with the document's first snapshot.
+  const firstSnapshot = !perf.loadReported;
+  perf.loadReported = true;
+  const nav = firstSnapshot ? performance.getEntriesByType('navigation')[0] : null;
+  const paint = {};
+  if (firstSnapshot) {
+    performance.getEntriesByType('paint').forEach((p) => { paint[p.name] = p.startTime; });
+  }
+  // Only count long tasks since the previous snapshot of this document.
+  const tasks = perf.longTasks.slice(perf.cursor);
+  perf.cursor = perf.longTasks.length;
+  return {
+    path: location.pathname,
+    navigation: nav ? {
+      type: nav.type,
+      dns: nav.domainLookupEnd - nav.domainLookupStart,
+      connect: nav.connectEnd - nav.connectStart,
+      ttfb: nav.responseStart - nav.startTime,
+      response: nav.responseEnd - nav.responseStart,
+      dom_interactive: nav.domInteractive,
+      dom_content_loaded: nav.domContentLoadedEventEnd,
+      load: nav.loadEventEnd,
+      transfer_size: nav.transferSize,
+    } : null,
+    first_paint: paint['first-paint'] ?? null,
+    first_contentful_paint: paint['first-contentful-paint'] ?? null,
+    largest_contentful_paint: firstSnapshot ? perf.lcp : null,
+    long_tasks: tasks.length,
+    long_task_ms: tasks.reduce((s, t) => s + t.duration, 0),
+    total_blocking_ms: tasks.reduce((s, t) => s + Math.max(0, t.duration - 50), 0),
+  };
+}
+"""
+
+# CDP Performance.getMetrics counters worth keeping, and their output names
+CDP_METRICS = {
+    "JSHeapUsedSize": "js_heap_used",
+    "JSHeapTotalSize": "js_heap_total",
+    "Nodes": "dom_nodes",
+    "JSEventListeners": "js_event_listeners",
+    "ScriptDuration": "script_duration",
+    "LayoutDuration": "layout_duration",
+    "TaskDuration": "task_duration",
+}
+
+_collectors: dict[int, "FrontendMetrics"] = {}
+
+
+class FrontendMetrics:
+    """Collects one sample per measured navigation or interaction."""
+
+    def __init__(self, page):
+        self.page = page
+        self.samples: list[dict] = []
+        page.add_init_script(OBSERVER_SCRIPT)
+        try:
+            self.cdp = page.context.new_cdp_session(page)
+            self.cdp.send("Performance.enable")
+        except Exception as e:
+            # Non-Chromium browsers have no CDP; keep the Performance API data.
+            logger.warning(f"CDP performance metrics unavailable: {e}")
+            self.cdp = None
+
+    def _cdp_metrics(self) -> dict:
+        if not self.cdp:
+            return {}
+        try:
+            metrics = self.cdp.send("Performance.getMetrics")["metrics"]
+        except Exception as e:
+            logger.warning(f"Could not read CDP metrics: {e}")
+            return {}
+        return {
+            CDP_METRICS[m["name"]]: m["value"]
+            for m in metrics
+            if m["name"] in CDP_METRICS
+        }
+
+    def capture(self, label: str, duration: float | None = None) -> dict:
+        """Snapshot the page's current performance data under ``label``."""
+        try:
+            sample = self.page.evaluate(SNAPSHOT_SCRIPT)
+        except Exception as e:
+            logger.warning(f"Could not read performance entries: {e}")
+            sample = {}
+        sample.update(self._cdp_metrics())
+        sample["label"] = label
+        sample["timestamp"] = time.time()
+        if duration is not None:
+            sample["duration_ms"] = round(duration * 1000, 1)
+        self.samples.append(sample)
+        return sample
+
+
+def attach(page) -> FrontendMetrics:
+    """Start collecting frontend metrics for ``page``."""
+    collector = FrontendMetrics(page)
+    _collectors[id(page)] = collector
+    return collector
+
+
+def detach(page) -> list[dict]:
+    """Stop collecting for ``page`` and return its samples."""
+    collector = _collectors.pop(id(page), None)
+    return collector.samples if collector else []
+
+
+@contextmanager
+def measure(page, label: str):
+    """Time the wrapped navigation/interaction and snapshot metrics after it.
+
+    A no-op when no collector is attached (e.g. running a flow directly).
+    """
+    collector = _collectors.get(id(page))
+    start = time.perf_counter()
+    yield
+    if collector:
+        sample = collector.capture(label, time.perf_counter() - start)
+        logger.info(
+            f"⏱ {label}: {sample.get('duration_ms')}ms, "
+            f"LCP {sample.get('largest_contentful_paint')}ms, "
+            f"long tasks {sample.get('long_tasks')}"
+        )
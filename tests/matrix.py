@@ -0,0 +1,176 @@
+"""Run the module flows against several environments at once.
+
+Each target gets its own pytest process, working directory and credentials,
+so reports, screenshots, videos, metrics and checkpoints never mix:
+
+    matrix/<name>/report.html, junit-results.xml, screenshots/, metrics/, ...
+
+Targets are ``name=url`` pairs on the command line or in ``MATRIX_TARGETS``
+(comma-separated). Credentials are looked up per target in
+``MATRIX_CREDENTIALS`` (JSON: ``{"staging": {"user_name": ..., "password":
+...}}``), then ``<NAME>_USER_NAME`` / ``<NAME>_PASSWORD``, then the usual
+``USER_NAME`` / ``PASSWORD``. Arguments after ``--`` are passed to pytest.
+
+    python -m tests.matrix dev2=https://dev2.smartclaim.uk \\
+        staging=https://staging.smartclaim.uk
+    MATRIX_TARGETS=dev2=https://dev2.smartclaim.uk python -m tests.matrix -- -k draft
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+MATRIX_DIR = os.getenv("MATRIX_DIR", "matrix")
+# Fixtures the flows read from the working directory
+TEST_FILES = ("output.pdf", "Martian Transcript copy.docx")
+PYTEST_ARGS = ["--browser=chromium", "--junitxml=junit-results.xml"]
+
+
+def parse_targets(specs: list[str]) -> dict[str, str]:
+    """``["dev2=https://...", ...]`` -> ``{"dev2": "https://..."}``."""
+    targets = {}
+    for spec in specs:
+        name, sep, url = spec.strip().partition("=")
+        if not sep or not name or not url:
+            raise ValueError(f"Expected name=url, got {spec!r}")
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", name):
+            raise ValueError(
+                f"Environment names may only use letters, digits, - and _: {name!r}"
+            )
+        targets[name] = url.rstrip("/")
+    return targets
+
+
+def credentials(name: str) -> tuple[str | None, str | None]:
+    """User name and password for the environment ``name``."""
+    shared = json.loads(os.getenv("MATRIX_CREDENTIALS") or "{}").get(name, {})
+    prefix = re.sub(r"[^A-Z0-9]", "_", name.upper())
+    return (
+        shared.get("user_name")
+        or os.getenv(f"{prefix}_USER_NAME")
+        or os.getenv("USER_NAME"),
+        shared.get("password")
+        or os.getenv(f"{prefix}_PASSWORD")
+        or os.getenv("PASSWORD"),
+    )
+
+
+def prepare_workdir(name: str) -> Path:
+    """Fresh ``matrix/<name>/`` with links to the upload fixtures."""
+    workdir = Path(MATRIX_DIR).resolve() / name
+    workdir.mkdir(parents=True, exist_ok=True)
+    for file_name in TEST_FILES:
+        source = Path(file_name).resolve()
+        target = workdir / file_name
+        if source.exists() and not target.exists():
+            target.symlink_to(source)
+    return workdir
+
+
+def run_target(name: str, base_url: str, pytest_args: list[str]) -> dict:
+    """Run the suite against one environment; returns its outcome."""
+    workdir = prepare_workdir(name)
+    user_name, password = credentials(name)
+    env = {
+        **os.environ,
+        "BASE_URL": base_url,
+        "TEST_ENVIRONMENT": name,
+        # Run history for duration-aware ordering, read from the repo checkout
+        "TEST_HISTORY_FILE": os.path.abspath(
+            os.getenv("TEST_HISTORY_FILE", "_site/report-history.json")
+        ),
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, [str(ROOT), os.getenv("PYTHONPATH")])
+        ),
+    }
+    if user_name:
+        env["USER_NAME"] = user_name
+    if password:
+        env["PASSWORD"] = password
+
+    cmd = [
+        sys.executable, "-m", "pytest", str(ROOT / "tests" / "run.py"),
+        "-c", str(ROOT / "pytest.ini"), "--rootdir", str(ROOT),
+        *PYTEST_ARGS, *pytest_args,
+    ]  # fmt: skip
+    logger.info(f"[{name}] {base_url}: starting")
+    start = time.time()
+    with open(workdir / "pytest.log", "w") as log:
+        code = subprocess.call(
+            cmd, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+    duration = time.time() - start
+    outcome = "passed" if code == 0 else f"failed (exit {code})"
+    logger.info(f"[{name}] {outcome} in {duration:.0f}s")
+    return {
+        "environment": name,
+        "base_url": base_url,
+        "exit_code": code,
+        "duration": round(duration, 1),
+    }
+
+
+def run_matrix(
+    targets: dict[str, str], pytest_args: list[str], workers: int | None = None
+) -> list[dict]:
+    """Run every target concurrently and write ``matrix/results.json``."""
+    with ThreadPoolExecutor(max_workers=workers or len(targets)) as pool:
+        futures = [
+            pool.submit(run_target, name, url, pytest_args)
+            for name, url in targets.items()
+        ]
+        results = [f.result() for f in futures]
+    with open(Path(MATRIX_DIR) / "results.json", "w") as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    pytest_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, pytest_args = argv[:split], argv[split + 1 :]
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "targets", nargs="*", help="name=url pairs (default: MATRIX_TARGETS)"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="environments run at once (default: all)"
+    )
+    args = parser.parse_args(argv)
+
+    specs = args.targets or [
+        s for s in os.getenv("MATRIX_TARGETS", "").split(",") if s.strip()
+    ]
+    if not specs:
+        parser.error("no targets given and MATRIX_TARGETS is empty")
+    try:
+        targets = parse_targets(specs)
+    except ValueError as e:
+        parser.error(str(e))
+
+    logging.basicConfig(level=logging.INFO)
+    results = run_matrix(targets, pytest_args, args.workers)
+    for r in results:
+        status = "passed" if r["exit_code"] == 0 else "FAILED"
+        print(
+            f"{r['environment']:<16} {status:<7} "
+            f"{r['duration']:>7.0f}s  {r['base_url']}"
+        )
+    return 0 if all(r["exit_code"] == 0 for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Per-test metric files shared by the harness and the dashboard.
+
+Each collector writes one JSON document per test under
+``metrics/<kind>/<test>.json``; the workflow archives the directory with the
+run and ``create-index.py`` summarises it into the history.
+"""
+
+import json
+import math
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+METRICS_DIR = os.getenv("METRICS_DIR", "metrics")
+
+# Metric payloads attached to the pytest-html report by conftest.py
+REPORT_EXTRAS = pytest.StashKey[list]()
+
+
+def safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "unnamed"
+
+
+def percentile(values: list[float | None], pct: float) -> float | None:
+    """Nearest-rank percentile of the non-None ``values``."""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    rank = min(len(values), max(1, math.ceil(pct / 100 * len(values))))
+    return values[rank - 1]
+
+
+def write_metrics(kind: str, name: str, data) -> Path:
+    """Write ``data`` as ``metrics/<kind>/<name>.json`` and return the path."""
+    path = Path(METRICS_DIR) / kind / f"{safe_name(name)}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+def attach_to_report(node, name: str, data, kind: str = "json") -> None:
+    """Queue ``data`` to be attached to the test's entry in the HTML report.
+
+    ``kind`` is the pytest-html extra type: ``json`` or ``html``.
+    """
+    node.stash.setdefault(REPORT_EXTRAS, []).append((name, data, kind))
@@ -0,0 +1,366 @@
+"""Synthetic monitoring: run the module flows on a schedule and export metrics.
+
+One browser and one logged-in context are kept warm across cycles; each flow
+runs in a fresh page of that context and only logs in again when the session
+has expired. Outcomes and per-stage latencies (from the flows' ``step()``
+timings) are exposed in Prometheus text format on a local HTTP endpoint
+and/or written to a node_exporter textfile-collector file.
+
+    python -m tests.monitor --interval 900 --port 9464
+    python -m tests.monitor --textfile /var/lib/node_exporter/smartclaim.prom
+"""
+
+import argparse
+import logging
+import os
+import random
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from playwright.sync_api import sync_playwright
+
+from tests import steps
+from tests.run import (
+    DRAFT_SUBMODULES,
+    QUALIFY_SUBMODULES,
+    REVIEW_SUBMODULES,
+    per_component,
+    per_component_textarea,
+)
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds: login/upload take seconds, generation minutes
+BUCKETS = (1, 2, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+FLOWS = {
+    "draft": lambda page: per_component(
+        page, "draft", DRAFT_SUBMODULES, reuse_session=True
+    ),
+    "qualify": lambda page: per_component(
+        page, "qualify", QUALIFY_SUBMODULES, reuse_session=True
+    ),
+    "review": lambda page: per_component_textarea(
+        page, "review", REVIEW_SUBMODULES, reuse_session=True
+    ),
+}
+
+HELP = {
+    "smartclaim_flow_runs_total": (
+        "counter",
+        "Completed monitoring flow runs by outcome.",
+    ),
+    "smartclaim_flow_duration_seconds": (
+        "histogram",
+        "End-to-end duration of a flow run.",
+    ),
+    "smartclaim_stage_duration_seconds": ("histogram", "Duration of each flow stage."),
+    "smartclaim_flow_last_success_timestamp_seconds": (
+        "gauge",
+        "Unix time of the flow's last success.",
+    ),
+    "smartclaim_monitor_consecutive_failures": ("gauge", "Cycles failed in a row."),
+    "smartclaim_monitor_cycles_total": ("counter", "Monitoring cycles started."),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return (
+        "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+    )
+
+
+class Metrics:
+    """Thread-safe counters, gauges and histograms rendered as Prometheus text."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[str, dict[tuple, dict]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._values.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            hist = self._histograms.setdefault(name, {}).setdefault(
+                key, {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+            )
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    hist["buckets"][i] += 1
+            hist["sum"] += value
+            hist["count"] += 1
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._values) | set(self._histograms)):
+                kind, help_text = HELP.get(name, ("untyped", name))
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for key, value in sorted(self._values.get(name, {}).items()):
+                    lines.append(f"{name}{_labels(dict(key))} {value:g}")
+                for key, hist in sorted(self._histograms.get(name, {}).items()):
+                    labels = dict(key)
+                    for bound, count in zip(BUCKETS, hist["buckets"]):
+                        lines.append(
+                            f"{name}_bucket{_labels({**labels, 'le': bound})} {count}"
+                        )
+                    inf = _labels({**labels, "le": "+Inf"})
+                    lines.append(f"{name}_bucket{inf} {hist['count']}")
+                    lines.append(f"{name}_sum{_labels(labels)} {hist['sum']:.3f}")
+                    lines.append(f"{name}_count{_labels(labels)} {hist['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically replace ``path`` so the collector never reads a partial file."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+def serve_metrics(
+    metrics: Metrics, port: int, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on ``host:port`` from a daemon thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(
+        target=server.serve_forever, name="metrics-http", daemon=True
+    ).start()
+    logger.info(f"Serving Prometheus metrics on {host}:{port}/metrics")
+    return server
+
+
+class Monitor:
+    """Runs the selected flows every ``interval`` seconds with jitter and backoff."""
+
+    def __init__(
+        self,
+        flows: list[str],
+        metrics: Metrics,
+        interval: float = 900,
+        jitter: float = 0.1,
+        backoff: float = 60,
+        max_backoff: float = 3600,
+        textfile: str | None = None,
+        headless: bool = True,
+    ):
+        self.flows = flows
+        self.metrics = metrics
+        self.interval = interval
+        self.jitter = jitter
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.textfile = textfile
+        self.headless = headless
+        self.failures = 0
+        self.stop_event = threading.Event()
+
+    def next_delay(self) -> float:
+        """Full interval after a good cycle, exponential backoff after failures."""
+        if self.failures:
+            delay = min(self.max_backoff, self.backoff * 2 ** (self.failures - 1))
+        else:
+            delay = self.interval
+        return max(0.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def run_flow(self, context, name: str) -> bool:
+        def on_step(event: str, record: dict) -> None:
+            if event != "end":
+                return
+            stage = record["step"]
+            if stage == "submodule":
+                stage = f"submodule:{record.get('submodule')}"
+            self.metrics.observe(
+                "smartclaim_stage_duration_seconds",
+                record["duration"],
+                flow=name,
+                stage=stage,
+            )
+
+        steps.add_listener(on_step)
+        start = time.time()
+        page = None
+        ok = False
+        try:
+            # Inside the try: a crashed browser fails the flow, not the daemon
+            page = context.new_page()
+            FLOWS[name](page)
+            ok = True
+        except Exception as e:
+            logger.error(f"Flow {name} failed: {e}")
+        finally:
+            steps.remove_listener(on_step)
+            steps.drain()
+            if page:
+                try:
+                    page.close()
+                except Exception:
+                    pass
+
+        self.metrics.observe(
+            "smartclaim_flow_duration_seconds", time.time() - start, flow=name
+        )
+        self.metrics.inc(
+            "smartclaim_flow_runs_total",
+            flow=name,
+            outcome="success" if ok else "failure",
+        )
+        if ok:
+            self.metrics.set(
+                "smartclaim_flow_last_success_timestamp_seconds", time.time(), flow=name
+            )
+        return ok
+
+    def launch(self, playwright):
+        """A fresh browser and context, or ``(None, None)`` if Chromium won't start."""
+        try:
+            browser = playwright.chromium.launch(headless=self.headless)
+            return browser, browser.new_context()
+        except Exception as e:
+            logger.error(f"Browser launch failed: {e}")
+            return None, None
+
+    def run(self, cycles: int | None = None) -> None:
+        completed = 0
+        with sync_playwright() as p:
+            browser, context = self.launch(p)
+            while not self.stop_event.is_set():
+                self.metrics.inc("smartclaim_monitor_cycles_total")
+                if context:
+                    results = [self.run_flow(context, name) for name in self.flows]
+                else:
+                    results = [False]
+                self.failures = 0 if all(results) else self.failures + 1
+                self.metrics.set(
+                    "smartclaim_monitor_consecutive_failures", self.failures
+                )
+                if self.textfile:
+                    self.metrics.write_textfile(self.textfile)
+
+                if not browser or not browser.is_connected():
+                    logger.warning("Browser disconnected, relaunching")
+                    browser, context = self.launch(p)
+
+                completed += 1
+                if cycles and completed >= cycles:
+                    break
+                delay = self.next_delay()
+                logger.info(
+                    f"Cycle {completed} done ({self.failures} failing), "
+                    f"next in {delay:.0f}s"
+                )
+                self.stop_event.wait(delay)
+            if browser:
+                try:
+                    browser.close()
+                except Exception:
+                    pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--flows", default="draft,qualify,review", help="comma-separated modules to run"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=900, help="seconds between cycles"
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.1,
+        help="random +/- fraction applied to every delay",
+    )
+    parser.add_argument(
+        "--backoff",
+        type=float,
+        default=60,
+        help="first retry delay after a failed cycle",
+    )
+    parser.add_argument(
+        "--max-backoff",
+        type=float,
+        default=3600,
+        help="cap for the exponential backoff",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.getenv("MONITOR_PORT", "9464")),
+        help="metrics port, 0 disables",
+    )
+    parser.add_argument(
+        "--host",
+        default=os.getenv("MONITOR_HOST", "127.0.0.1"),
+        help="metrics bind address",
+    )
+    parser.add_argument(
+        "--textfile", help="also write metrics to this textfile-collector path"
+    )
+    parser.add_argument(
+        "--cycles", type=int, help="stop after N cycles (default: run forever)"
+    )
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    flows = [f.strip() for f in args.flows.split(",") if f.strip()]
+    unknown = set(flows) - set(FLOWS)
+    if unknown:
+        parser.error(f"unknown flows: {', '.join(sorted(unknown))}")
+
+    metrics = Metrics()
+    if args.port:
+        serve_metrics(metrics, args.port, args.host)
+    monitor = Monitor(
+        flows,
+        metrics,
+        interval=args.interval,
+        jitter=args.jitter,
+        backoff=args.backoff,
+        max_backoff=args.max_backoff,
+        textfile=args.textfile,
+        headless=not args.headed,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: monitor.stop_event.set())
+    try:
+        monitor.run(cycles=args.cycles)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
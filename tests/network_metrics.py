@@ -0,0 +1,136 @@
+"""Per-request network timing capture, grouped by normalised endpoint.
+
+A :class:`NetworkRecorder` listens to a browser context for finished and
+failed requests. Timing phases and sizes are read once, when the test is
+done, so the event handlers stay cheap and never call back into the browser
+while a flow is running.
+"""
+
+import logging
+import re
+from urllib.parse import urlsplit
+
+from tests.metrics import percentile
+
+logger = logging.getLogger(__name__)
+
+API_RESOURCE_TYPES = ("xhr", "fetch", "document")  # static assets are not summarised
+
+# Path segments that identify a record rather than an endpoint
+ID_SEGMENT = re.compile(
+    r"^(?:"
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"  # uuid
+    r"|\d+"  # numeric id
+    r"|[0-9a-f]{16,}"  # hex digest / object id
+    # opaque token: long, contains a digit, no _/- word breaks
+    r"|(?=[A-Za-z]*\d)[A-Za-z0-9]{24,}" r")$",
+    re.IGNORECASE,
+)
+
+
+def normalize_endpoint(method: str, url: str) -> str:
+    """``GET https://host/api/files/123?x=1`` -> ``GET host/api/files/{id}``."""
+    parts = urlsplit(url)
+    segments = [
+        "{id}" if ID_SEGMENT.match(segment) else segment
+        for segment in parts.path.split("/")
+    ]
+    return f"{method} {parts.netloc}{'/'.join(segments) or '/'}"
+
+
+def _phase(timing: dict, start: str, end: str) -> float | None:
+    """Duration between two Playwright timing marks; -1 marks are unavailable."""
+    a, b = timing.get(start, -1), timing.get(end, -1)
+    if a is None or b is None or a < 0 or b < 0:
+        return None
+    return round(b - a, 1)
+
+
+class NetworkRecorder:
+    """Records every request made by a browser context."""
+
+    def __init__(self, context):
+        self.context = context
+        self._finished = []
+        self._failed = []
+        context.on("requestfinished", self._finished.append)
+        context.on("requestfailed", self._failed.append)
+
+    def _record(self, request, failed: bool) -> dict:
+        timing = request.timing
+        entry = {
+            "endpoint": normalize_endpoint(request.method, request.url),
+            "url": request.url.split("?", 1)[0],
+            "method": request.method,
+            "resource_type": request.resource_type,
+            "failed": failed,
+            "status": None,
+            "dns": _phase(timing, "domainLookupStart", "domainLookupEnd"),
+            "connect": _phase(timing, "connectStart", "connectEnd"),
+            "ttfb": _phase(timing, "requestStart", "responseStart"),
+            "download": _phase(timing, "responseStart", "responseEnd"),
+            "total": (
+                round(timing["responseEnd"], 1)
+                if timing.get("responseEnd", -1) >= 0
+                else None
+            ),
+            "bytes": 0,
+        }
+        if failed:
+            entry["error"] = request.failure
+            return entry
+        try:
+            response = request.response()
+            entry["status"] = response.status if response else None
+            sizes = request.sizes()
+            entry["bytes"] = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception as e:
+            logger.debug(f"No response details for {request.url}: {e}")
+        return entry
+
+    def collect(self) -> list[dict]:
+        """Return one timing record per request. Call before closing the context."""
+        records = [self._record(r, failed=False) for r in self._finished]
+        records += [self._record(r, failed=True) for r in self._failed]
+        self._finished.clear()
+        self._failed.clear()
+        _run_records.extend(records)
+        return records
+
+
+# Every request collected this session, for the run-wide summary
+_run_records: list[dict] = []
+
+
+def summarize(records: list[dict]) -> dict[str, dict]:
+    """p50/p95/max latency, call count, error count and bytes per API endpoint.
+
+    The one summary both the HTML report and the dashboard show.
+    """
+    groups: dict[str, list[dict]] = {}
+    for r in records:
+        if r.get("resource_type") in API_RESOURCE_TYPES:
+            groups.setdefault(r["endpoint"], []).append(r)
+    summary = {}
+    for endpoint, rows in sorted(groups.items()):
+        totals = [r["total"] for r in rows if r.get("total") is not None]
+        ttfbs = [r["ttfb"] for r in rows if r.get("ttfb") is not None]
+        summary[endpoint] = {
+            "count": len(rows),
+            "errors": sum(
+                1 for r in rows if r.get("failed") or (r.get("status") or 0) >= 400
+            ),
+            "bytes": sum(r.get("bytes") or 0 for r in rows),
+            "resource_type": rows[0].get("resource_type"),
+            "p50": percentile(totals, 50),
+            "p95": percentile(totals, 95),
+            "max": max(totals) if totals else None,
+            "ttfb_p50": percentile(ttfbs, 50),
+            "download_p50": percentile([r.get("download") for r in rows], 50),
+        }
+    return summary
+
+
+def run_summary() -> dict[str, dict]:
+    """:func:`summarize` over every request collected this session."""
+    return summarize(_run_records)
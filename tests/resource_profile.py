@@ -0,0 +1,212 @@
+"""Background CPU/RSS/I/O sampler for the pytest process and its children.
+
+Reads ``/proc`` directly (the CI runners are Linux) so it adds no dependency.
+Every sample walks the process tree below pytest and groups processes by
+role: the pytest process itself, the Playwright driver, the Chromium browser,
+renderer, GPU and utility processes, and the ffmpeg video encoder.
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = float(
+    os.getenv("RESOURCE_SAMPLE_INTERVAL", "1")
+)  # seconds, 0 disables
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return f.read().decode(errors="replace")
+    except OSError:
+        return None
+
+
+def classify(pid: int, root: int, cmdline: str) -> str:
+    """Role of a process in the test session, from its command line."""
+    if pid == root:
+        return "pytest"
+    if "ffmpeg" in cmdline:
+        return "video_encoder"
+    if "--type=renderer" in cmdline:
+        return "renderer"
+    if "--type=gpu-process" in cmdline:
+        return "gpu"
+    if "--type=" in cmdline:
+        return "browser_utility"
+    if "chrom" in cmdline or "headless_shell" in cmdline:
+        return "browser"
+    if "node" in cmdline or "playwright" in cmdline:
+        return "driver"
+    return "other"
+
+
+def _process_tree(root: int) -> list[int]:
+    """``root`` and all of its descendants."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        stat = _read(f"/proc/{entry}/stat")
+        if not stat:
+            continue
+        # The command name may contain spaces/parens; fields resume after ')'.
+        fields = stat.rsplit(")", 1)[-1].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+    tree, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+
+def _process_stats(pid: int) -> dict | None:
+    stat = _read(f"/proc/{pid}/stat")
+    statm = _read(f"/proc/{pid}/statm")
+    if not stat or not statm:
+        return None
+    fields = stat.rsplit(")", 1)[-1].split()
+    io = {}
+    for line in (_read(f"/proc/{pid}/io") or "").splitlines():
+        key, _, value = line.partition(":")
+        io[key] = int(value)
+    return {
+        "cpu_ticks": int(fields[11]) + int(fields[12]),  # utime + stime
+        "rss": int(statm.split()[1]) * PAGE_SIZE,
+        "read_bytes": io.get("read_bytes", 0),
+        "write_bytes": io.get("write_bytes", 0),
+    }
+
+
+class ResourceSampler(threading.Thread):
+    """Samples the process tree every ``interval`` seconds until stopped."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL, root: int | None = None):
+        super().__init__(name="resource-sampler", daemon=True)
+        self.interval = interval
+        self.root = root or os.getpid()
+        self.samples: list[dict] = []
+        self._previous: dict[int, dict] = {}
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def supported(cls) -> bool:
+        return os.path.exists("/proc/self/stat")
+
+    def sample(self) -> dict:
+        with self._lock:
+            return self._sample()
+
+    def _sample(self) -> dict:
+        now = time.time()
+        roles: dict[str, dict] = {}
+        current = {}
+        for pid in _process_tree(self.root):
+            stats = _process_stats(pid)
+            if not stats:
+                continue
+            cmdline = (_read(f"/proc/{pid}/cmdline") or "").replace("\0", " ")
+            stats["role"] = classify(pid, self.root, cmdline)
+            stats["at"] = now
+            current[pid] = stats
+            previous = self._previous.get(pid)
+            role = roles.setdefault(
+                stats["role"],
+                {
+                    "processes": 0,
+                    "cpu": 0.0,
+                    "rss": 0,
+                    "read_bytes": 0,
+                    "write_bytes": 0,
+                },
+            )
+            role["processes"] += 1
+            role["rss"] += stats["rss"]
+            if previous:
+                elapsed = now - previous["at"]
+                ticks = stats["cpu_ticks"] - previous["cpu_ticks"]
+                role["cpu"] += ticks / CLOCK_TICKS / elapsed * 100 if elapsed else 0
+                role["read_bytes"] += stats["read_bytes"] - previous["read_bytes"]
+                role["write_bytes"] += stats["write_bytes"] - previous["write_bytes"]
+        self._previous = current
+        for role in roles.values():
+            role["cpu"] = round(role["cpu"], 1)
+        sample = {"at": now, "roles": roles}
+        self.samples.append(sample)
+        return sample
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"Resource sampling failed: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join(timeout=self.interval + 5)
+
+    def profile(self, start: float, end: float) -> dict:
+        """Peaks, averages and I/O totals per role for samples in [start, end]."""
+        with self._lock:
+            window = [s for s in self.samples if start <= s["at"] <= end]
+        roles: dict[str, dict] = {}
+        for s in window:
+            for name, r in s["roles"].items():
+                role = roles.setdefault(
+                    name,
+                    {
+                        "peak_cpu": 0.0,
+                        "cpu_total": 0.0,
+                        "cpu_samples": 0,
+                        "peak_rss": 0,
+                        "peak_processes": 0,
+                        "read_bytes": 0,
+                        "write_bytes": 0,
+                    },
+                )
+                role["peak_cpu"] = max(role["peak_cpu"], r["cpu"])
+                role["cpu_total"] += r["cpu"]
+                role["cpu_samples"] += 1
+                role["peak_rss"] = max(role["peak_rss"], r["rss"])
+                role["peak_processes"] = max(role["peak_processes"], r["processes"])
+                role["read_bytes"] += r["read_bytes"]
+                role["write_bytes"] += r["write_bytes"]
+        for role in roles.values():
+            # Over the samples the role's processes were alive in
+            role["avg_cpu"] = round(role.pop("cpu_total") / role.pop("cpu_samples"), 1)
+        totals = [
+            (
+                sum(r["cpu"] for r in s["roles"].values()),
+                sum(r["rss"] for r in s["roles"].values()),
+            )
+            for s in window
+        ]
+        return {
+            "start": start,
+            "end": end,
+            "interval": self.interval,
+            "samples": len(window),
+            "peak_cpu": round(max((c for c, _ in totals), default=0), 1),
+            "peak_rss": max((m for _, m in totals), default=0),
+            "roles": roles,
+            "timeline": [
+                {
+                    "at": round(s["at"] - start, 1),
+                    **{
+                        name: {"cpu": r["cpu"], "rss": r["rss"]}
+                        for name, r in s["roles"].items()
+                    },
+                }
+                for s in window
+            ],
+        }
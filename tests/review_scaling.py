@@ -0,0 +1,150 @@
+"""Helpers for the review input-size scaling benchmark.
+
+- :func:`generate_narrative` builds deterministic R&D-claim style text of a
+  given word count, so runs at the same size are comparable.
+- :func:`fill_textareas` fills every textarea in one in-page call (native
+  value setter plus input/change events, which React picks up) instead of
+  four Playwright round-trips per field.
+- :func:`watch_sections` / :func:`section_times` time when each review
+  section first shows generated content, measured in the page from the
+  Submit click (not from the wait for Submit to become enabled).
+"""
+
+import random
+
+SUBJECTS = [
+    "the team",
+    "our engineers",
+    "the company",
+    "the project lead",
+    "the data science group",
+    "the platform team",
+]
+ACTIONS = [
+    "investigated",
+    "prototyped",
+    "evaluated",
+    "benchmarked",
+    "redesigned",
+    "iterated on",
+    "systematically tested",
+]
+OBJECTS = [
+    "a novel caching layer for claim documents",
+    "an approach to extracting structured data from scanned forms",
+    "alternative model architectures for classifying expenditure",
+    "a streaming pipeline that had no precedent in the sector",
+    "methods to reconcile inconsistent ledger exports",
+    "a scheduler for long-running document analysis jobs",
+]
+OUTCOMES = [
+    "because no publicly available solution met the latency requirements",
+    "since competent professionals could not readily deduce the outcome",
+    "which exposed technological uncertainty about scalability",
+    "and the baseline approach failed under production load",
+    "resolving the uncertainty only after several failed iterations",
+    "advancing the state of knowledge beyond the industry baseline",
+]
+
+
+def generate_narrative(words: int, seed: int = 0) -> str:
+    """Deterministic narrative of exactly ``words`` words."""
+    rng = random.Random(seed)
+    out: list[str] = []
+    while len(out) < words:
+        sentence = (
+            f"{rng.choice(SUBJECTS).capitalize()} {rng.choice(ACTIONS)} "
+            f"{rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}."
+        )
+        out.extend(sentence.split())
+    text = " ".join(out[:words])
+    return text if text.endswith(".") else text + "."
+
+
+FILL_SCRIPT = """
+(texts) => {
+  const setter = Object.getOwnPropertyDescriptor(
+    HTMLTextAreaElement.prototype, 'value').set;
+  const areas = Array.from(document.querySelectorAll('textarea'));
+  areas.forEach((el, i) => {
+    setter.call(el, texts[i % texts.length]);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+  });
+  return areas.length;
+}
+"""
+
+
+def fill_textareas(page, texts: list[str]) -> int:
+    """Fill all textareas (cycling through ``texts``) in one call; returns the count."""
+    return page.evaluate(FILL_SCRIPT, texts)
+
+
+SECTION_OBSERVER_SCRIPT = """
+(ids) => {
+  const found = window.__sectionTimes = {};
+  window.__submitAt = undefined;
+  if (!window.__submitListener) {
+    // Capture phase: stamped before the app's own click handler runs
+    window.__submitListener = (e) => {
+      const button = e.target.closest && e.target.closest('button');
+      if (button && /\\bsubmit\\b/i.test(button.textContent)
+          && window.__submitAt === undefined) {
+        window.__submitAt = performance.now();
+      }
+    };
+    document.addEventListener('click', window.__submitListener, true);
+  }
+  const textOf = (id) => {
+    const el = document.getElementById(id);
+    return el ? el.textContent.trim() : '';
+  };
+  // Content left over from before the submit does not count.
+  const initial = Object.fromEntries(ids.map((id) => [id, textOf(id)]));
+  const check = () => {
+    for (const id of ids) {
+      if (found[id] !== undefined) continue;
+      const text = textOf(id);
+      if (text && !text.includes('No content') && text !== initial[id]) {
+        found[id] = performance.now();
+      }
+    }
+  };
+  if (window.__sectionObserver) window.__sectionObserver.disconnect();
+  window.__sectionObserver = new MutationObserver(check);
+  window.__sectionObserver.observe(document.body, {
+    childList: true, subtree: true, characterData: true,
+  });
+  check();
+}
+"""
+
+
+def watch_sections(page, section_ids: list[str]) -> None:
+    """Start timing ``section_ids`` and the next Submit click; call before submit()."""
+    page.evaluate(SECTION_OBSERVER_SCRIPT, section_ids)
+
+
+def wait_for_sections(page, count: int, timeout_ms: float) -> bool:
+    """Wait until ``count`` sections have content; False on timeout."""
+    try:
+        page.wait_for_function(
+            "(n) => Object.keys(window.__sectionTimes || {}).length >= n",
+            arg=count,
+            timeout=timeout_ms,
+            polling=1000,
+        )
+        return True
+    except Exception:
+        return False
+
+
+def section_times(page) -> dict[str, float]:
+    """Seconds from the Submit click until each watched section showed content."""
+    start, found = page.evaluate(
+        "() => [window.__submitAt, window.__sectionTimes || {}]"
+    )
+    if start is None:
+        return {}
+    return {sid: round((at - start) / 1000, 2) for sid, at in found.items()}
@@ -1,9 +1,26 @@
 import json
 import logging
 import os
+import time
 
+import pytest
 from playwright.sync_api import expect
 
+from tests import events
+from tests.checkpoint import Checkpoint
+from tests.frontend_metrics import measure
+from tests.metrics import write_metrics
+from tests.review_scaling import (
+    fill_textareas,
+    generate_narrative,
+    section_times,
+    wait_for_sections,
+    watch_sections,
+)
+from tests.status_timeline import StatusTimeline
+from tests.steps import step
+from tests.upload_benchmark import file_metrics, make_copies, summarize
+
 # Configure logging for better test reporting
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,81 +28,172 @@ logger = logging.getLogger(__name__)
 BASE_URL = os.getenv("BASE_URL")
 GENERATE_WAIT_TIMEOUT = 5  # minutes
 UPLOAD_WAIT_TIMEOUT = 3  # minutes
+# Status changes are timestamped in the page by a MutationObserver; polling
+# only decides how quickly the test notices the final status.
+STATUS_POLL_INTERVAL = 2  # seconds
+# Re-submit rounds for submodules that failed to generate
+SUBMODULE_RETRIES = int(os.getenv("SUBMODULE_RETRIES", "0"))
+# Review scaling benchmark: opt-in, words per textarea for each run
+REVIEW_BENCHMARK = os.getenv("REVIEW_BENCHMARK") == "1"
+REVIEW_BENCHMARK_WORDS = [
+    int(w)
+    for w in os.getenv("REVIEW_BENCHMARK_WORDS", "50,500,2000,5000,10000").split(",")
+]
+# Concurrent upload benchmark: opt-in, files uploaded at once for each run
+UPLOAD_BENCHMARK = os.getenv("UPLOAD_BENCHMARK") == "1"
+UPLOAD_BENCHMARK_FILES = [
+    int(n) for n in os.getenv("UPLOAD_BENCHMARK_FILES", "1,2,4,8").split(",")
+]
+UPLOAD_BENCHMARK_MODULE = os.getenv("UPLOAD_BENCHMARK_MODULE", "draft")
+# "batch": one input selection with all files; "staggered": one file at a time
+UPLOAD_BENCHMARK_MODE = os.getenv("UPLOAD_BENCHMARK_MODE", "batch")
+UPLOAD_BENCHMARK_STAGGER = float(os.getenv("UPLOAD_BENCHMARK_STAGGER", "2"))  # seconds
 # Ensure screenshots directory exists
 os.makedirs("screenshots", exist_ok=True)
 
 
+def screenshot(page, path: str) -> None:
+    """Save a screenshot and announce it on the live event stream."""
+    page.screenshot(path=path)
+    events.publish("screenshot", path=path)
+
+
 def login(page, module: str) -> None:
     """Login and navigate to the given module page."""
     logger.info("Step 1: Performing login")
-    page.goto(url=f"{BASE_URL}/login")
-    page.screenshot(path="screenshots/01_login_page.png")
+    with measure(page, "/login"):
+        page.goto(url=f"{BASE_URL}/login")
+    screenshot(page, "screenshots/01_login_page.png")
     logger.info("✓ Navigated to login page")
 
     page.locator("#username").fill(os.getenv("USER_NAME"))
     page.locator("#password").fill(os.getenv("PASSWORD"))
-    page.locator("form").get_by_role("button", name="Log in").click()
-
-    # Wait for the post-login redirect to settle before touching the nav. The
-    # app prerenders the login form (instant paint) and then redirects to
-    # /draft once auth resolves; clicking a module link before that lands races
-    # the redirect and leaves us on /draft (see global_state KeyError below).
-    page.wait_for_url("**/draft")
-    page.screenshot(path=f"screenshots/{module}_02_login_completed.png")
+    with measure(page, "/login submit"):
+        page.locator("form").get_by_role("button", name="Log in").click()
+
+        # Wait for the post-login redirect to settle before touching the nav.
+        # The app prerenders the login form (instant paint) and then redirects
+        # to /draft once auth resolves; clicking a module link before that
+        # lands races the redirect and leaves us on /draft (see global_state
+        # KeyError below).
+        page.wait_for_url("**/draft")
+    screenshot(page, f"screenshots/{module}_02_login_completed.png")
     logger.info("✓ Login completed successfully")
 
-    page.get_by_role("link", name=module.capitalize()).click()
-    # Confirm the module page is actually loaded before reading its state.
-    page.wait_for_url(f"**/{module}")
+    with measure(page, f"/{module}"):
+        page.get_by_role("link", name=module.capitalize()).click()
+        # Confirm the module page is actually loaded before reading its state.
+        page.wait_for_url(f"**/{module}")
 
 
-def submit_and_verify(page, module: str, submodules: dict[str, list[str]]) -> None:
-    """Click Submit and verify all submodule content is generated."""
-    logger.info("Clicking Submit and verifying content generation")
-    total = sum(len(v) for v in submodules.values())
-    successful = 0
-    failed: list[str] = []
+def wait_for_submodule(page, module: str, submod: str, subsubmod: str) -> None:
+    """Wait until one submodule section shows generated content."""
+    logger.info(f"Waiting for content: {module}_{submod}_{subsubmod}")
+    content_selector = f"#main-content-{module}_{submod}_{subsubmod}"
+    expect(page.locator(content_selector)).not_to_contain_text(
+        "No content", timeout=GENERATE_WAIT_TIMEOUT * 60 * 1000
+    )
+    expect(page.locator(content_selector)).not_to_be_empty(
+        timeout=GENERATE_WAIT_TIMEOUT * 60 * 1000
+    )
+    logger.info(f"✓ {submod}/{subsubmod}: Content generated")
+    screenshot(page, f"screenshots/{module}_{submod}_{subsubmod}_generated.png")
+
 
+def submit(page, module: str) -> None:
+    """Click Submit once the module is ready to generate."""
     try:
-        # Submit is rendered but disabled until the module is ready (e.g. all
-        # files Ready), so wait for enabled rather than visible.
-        submit_button = page.get_by_role("button", name="Submit")
-        expect(submit_button).to_be_enabled(timeout=60 * 1000)
-        submit_button.click()
+        with step("submit", module=module):
+            # Submit is rendered but disabled until the module is ready (e.g.
+            # all files Ready), so wait for enabled rather than visible.
+            submit_button = page.get_by_role("button", name="Submit")
+            expect(submit_button).to_be_enabled(timeout=60 * 1000)
+            with measure(page, f"/{module} submit"):
+                submit_button.click()
         logger.info("✓ Submitted successfully")
     except Exception as e:
         logger.error(f"Submit failed: {e}")
-        page.screenshot(path=f"screenshots/{module}_submit_failed.png")
+        screenshot(page, f"screenshots/{module}_submit_failed.png")
         raise
 
-    for submod, subsubmods in submodules.items():
-        for subsubmod in subsubmods:
+
+def verify_submodules(
+    page,
+    module: str,
+    pending: list[tuple[str, str]],
+    checkpoint: Checkpoint | None = None,
+) -> list[tuple[str, str]]:
+    """Wait for each pending submodule; returns the ones that failed."""
+    failed = []
+    with step("generate", module=module):
+        for submod, subsubmod in pending:
             try:
-                logger.info(f"Waiting for content: {module}_{submod}_{subsubmod}")
-                content_selector = f"#main-content-{module}_{submod}_{subsubmod}"
-                expect(page.locator(content_selector)).not_to_contain_text(
-                    "No content", timeout=GENERATE_WAIT_TIMEOUT * 60 * 1000
-                )
-                expect(page.locator(content_selector)).not_to_be_empty(
-                    timeout=GENERATE_WAIT_TIMEOUT * 60 * 1000
-                )
-                logger.info(f"✓ {submod}/{subsubmod}: Content generated")
-                page.screenshot(
-                    path=f"screenshots/{module}_{submod}_{subsubmod}_generated.png"
-                )
-                successful += 1
+                with step(
+                    "submodule", module=module, submodule=f"{submod}/{subsubmod}"
+                ):
+                    wait_for_submodule(page, module, submod, subsubmod)
+                if checkpoint:
+                    checkpoint.mark_generated(f"{submod}/{subsubmod}")
             except Exception as e:
                 logger.error(f"{submod}/{subsubmod} failed: {e}")
-                page.screenshot(
-                    path=f"screenshots/{module}_{submod}_{subsubmod}_failed.png"
+                screenshot(
+                    page, f"screenshots/{module}_{submod}_{subsubmod}_failed.png"
                 )
-                failed.append(f"{submod}/{subsubmod}")
-                continue
+                failed.append((submod, subsubmod))
+    return failed
+
+
+def submit_and_verify(
+    page,
+    module: str,
+    submodules: dict[str, list[str]],
+    checkpoint: Checkpoint | None = None,
+    retries: int = SUBMODULE_RETRIES,
+) -> None:
+    """Click Submit and verify all submodule content is generated.
 
-    logger.info(f"✓ Generated {successful}/{total} submodules")
+    Submodules already generated according to ``checkpoint`` are not waited
+    for again, and failed submodules are re-submitted up to ``retries`` times,
+    waiting only for those.
+    """
+    logger.info("Clicking Submit and verifying content generation")
+    total = sum(len(v) for v in submodules.values())
+    done = checkpoint.generated if checkpoint else set()
+    pending = [
+        (submod, subsubmod)
+        for submod, subsubmods in submodules.items()
+        for subsubmod in subsubmods
+        if f"{submod}/{subsubmod}" not in done
+    ]
+    if len(pending) < total:
+        logger.info(
+            f"Resuming: {total - len(pending)}/{total} submodules already generated"
+        )
+
+    submit(page, module)
+    failed = verify_submodules(page, module, pending, checkpoint)
+
+    for attempt in range(1, retries + 1):
+        if not failed:
+            break
+        logger.info(
+            f"Retry {attempt}/{retries}: "
+            f"re-submitting for {len(failed)} failed submodules"
+        )
+        with step("retry", module=module, attempt=attempt, submodules=len(failed)):
+            try:
+                submit(page, module)
+            except Exception:
+                # Still worth re-waiting: slow submodules may just be late.
+                logger.warning(
+                    "Re-submit failed, waiting for the failed submodules again"
+                )
+            failed = verify_submodules(page, module, failed, checkpoint)
+
+    logger.info(f"✓ Generated {total - len(failed)}/{total} submodules")
     assert not failed, (
         f"{module}: {len(failed)}/{total} submodules did not generate content: "
-        f"{', '.join(failed)}"
+        f"{', '.join(f'{submod}/{subsubmod}' for submod, subsubmod in failed)}"
     )
 
 
@@ -128,20 +236,24 @@ def delete_leftover_uploads(page, module: str, file_name: str) -> None:
         logger.info(f"✓ Deleted leftover file {file_id}")
 
 
-def upload_and_process(page, module: str) -> str:
-    """Upload file, wait for processing, accept results. Returns file_id."""
-    import time
+def upload_file(
+    page, module: str, file_name: str = "output.pdf"
+) -> tuple[str, float, float]:
+    """Upload a file and wait for it to register in the app state.
 
+    Returns the new file_id, the upload start time and the time the id first
+    appeared in the app state.
+    """
     logger.info("Step 2: Uploading file")
     wait_for_files_list(page)
-    delete_leftover_uploads(page, module, "output.pdf")
+    delete_leftover_uploads(page, module, file_name)
     files_before = set(get_module_files(page, module))
 
-    page.locator("#file-upload").set_input_files("output.pdf")
-    page.screenshot(path=f"screenshots/{module}_03_file_uploaded.png")
+    upload_started = time.time()
+    with measure(page, f"/{module} upload"):
+        page.locator("#file-upload").set_input_files(file_name)
     logger.info("✓ File uploaded successfully")
 
-    logger.info("Step 3: Waiting for file processing")
     # The state entry is created asynchronously after the change event, so
     # poll for it instead of reading global_state once.
     file_id = None
@@ -150,48 +262,107 @@ def upload_and_process(page, module: str) -> str:
         new_files = set(get_module_files(page, module)) - files_before
         if new_files:
             file_id = new_files.pop()
+            registered_at = time.time()
             break
-        time.sleep(1)
+        time.sleep(0.25)
     if not file_id:
-        page.screenshot(path=f"screenshots/{module}_04_upload_not_registered.png")
+        screenshot(page, f"screenshots/{module}_04_upload_not_registered.png")
         raise AssertionError(f"{module}: uploaded file never appeared in the app state")
     logger.info(f"File ID: {file_id}")
+    return file_id, upload_started, registered_at
+
+
+def wait_for_processing(
+    page,
+    module: str,
+    file_id: str,
+    uploaded_at: float,
+    registered_at: float | None = None,
+) -> StatusTimeline:
+    """Wait for the file's status to reach Ready, recording every transition."""
+    logger.info("Step 3: Waiting for file processing")
+    timeline = StatusTimeline(
+        page, module, file_id, uploaded_at=uploaded_at, registered_at=registered_at
+    )
+    # Taken once the observer is installed, so it cannot delay status stamps
+    screenshot(page, f"screenshots/{module}_03_file_uploaded.png")
 
     start_time = time.time()
     max_wait_seconds = UPLOAD_WAIT_TIMEOUT * 60
 
     while (time.time() - start_time) < max_wait_seconds:
         try:
-            current_status = page.locator(f"#status-cell-{file_id}").text_content(
-                timeout=10 * 1000
-            )
-            logger.info(f"Processing status: {current_status}")
+            for transition in timeline.poll():
+                logger.info(f"Processing status: {transition['status']}")
+            current_status = timeline.current or ""
             if "Ready" in current_status:
+                timeline.finish("ready")
                 logger.info("✓ File processing completed")
-                page.screenshot(
-                    path=f"screenshots/{module}_04_processing_completed.png"
-                )
+                screenshot(page, f"screenshots/{module}_04_processing_completed.png")
                 break
             elif "Error" in current_status or "Failed" in current_status:
+                timeline.finish("failed")
                 logger.error(f"Processing failed: {current_status}")
-                page.screenshot(path=f"screenshots/{module}_04_processing_failed.png")
+                screenshot(page, f"screenshots/{module}_04_processing_failed.png")
                 raise AssertionError(
                     f"{module}: file processing failed: {current_status}"
                 )
-            time.sleep(10)
+            time.sleep(STATUS_POLL_INTERVAL)
         except AssertionError:
             raise
         except Exception as e:
             logger.warning(f"Error checking status: {e}")
-            time.sleep(10)
+            time.sleep(STATUS_POLL_INTERVAL)
     else:
+        timeline.finish("timeout")
         logger.error("File processing timed out")
-        page.screenshot(path=f"screenshots/{module}_04_processing_timeout.png")
+        screenshot(page, f"screenshots/{module}_04_processing_timeout.png")
         raise AssertionError(
             f"{module}: file processing did not reach Ready within "
             f"{UPLOAD_WAIT_TIMEOUT} minutes"
         )
 
+    for stage in timeline.stages():
+        logger.info(f"  stage {stage['stage']}: {stage['duration_ms'] / 1000:.1f}s")
+    return timeline
+
+
+def file_is_ready(page, module: str, file_id: str) -> bool:
+    """Whether ``file_id`` is still in the module with a Ready status."""
+    wait_for_files_list(page)
+    if file_id not in get_module_files(page, module):
+        return False
+    try:
+        status = page.locator(f"#status-cell-{file_id}").text_content(timeout=10 * 1000)
+    except Exception:
+        return False
+    return "Ready" in (status or "")
+
+
+def upload_and_process(page, module: str, checkpoint: Checkpoint | None = None) -> str:
+    """Upload file, wait for processing, accept results. Returns file_id.
+
+    A file that ``checkpoint`` recorded as Ready is reused if the module
+    still lists it as Ready.
+    """
+    if checkpoint and checkpoint.file_id and checkpoint.file_ready:
+        if file_is_ready(page, module, checkpoint.file_id):
+            logger.info(
+                f"✓ Reusing processed file {checkpoint.file_id} from checkpoint"
+            )
+            return checkpoint.file_id
+        logger.info("Checkpointed file is gone or no longer Ready, uploading again")
+        checkpoint.clear()
+
+    with step("upload", module=module):
+        file_id, uploaded_at, registered_at = upload_file(page, module)
+    if checkpoint:
+        checkpoint.mark_file(file_id, ready=False)
+    with step("processing", module=module, file_id=file_id):
+        wait_for_processing(page, module, file_id, uploaded_at, registered_at)
+    if checkpoint:
+        checkpoint.mark_file(file_id, ready=True)
+
     # Try to accept results if available
     try:
         accept_button = page.get_by_role("button", name="Accept")
@@ -217,23 +388,68 @@ def cleanup_file(page, module: str, file_id: str | None) -> None:
             f"#file-row-{file_id}", state="detached", timeout=30 * 1000
         )
         logger.info("✓ Deleted file successfully")
-        page.screenshot(path=f"screenshots/{module}_cleanup_completed.png")
+        screenshot(page, f"screenshots/{module}_cleanup_completed.png")
     except Exception as e:
         logger.warning(f"Cleanup failed: {e}")
 
 
-def per_component(page, module: str, submodules: dict[str, list[str]]) -> None:
-    """Test flow for file-upload modules (draft, qualify, etc.)."""
-    logger.info(f"🚀 Starting {module} test workflow")
+def open_module(page, module: str) -> None:
+    """Open a module page in an existing session, logging in only if needed."""
+    with measure(page, f"/{module}"):
+        page.goto(url=f"{BASE_URL}/{module}")
+        page.wait_for_load_state("networkidle")
+    if "/login" in page.url:
+        logger.info("Session expired, logging in again")
+        login(page, module)
+
+
+def per_component(
+    page,
+    module: str,
+    submodules: dict[str, list[str]],
+    reuse_session: bool = False,
+    documents=None,
+) -> None:
+    """Test flow for file-upload modules (draft, qualify, etc.).
 
-    login(page, module)
-    file_id = upload_and_process(page, module)
+    With a ``documents`` cache (see tests/documents.py) the processed upload
+    is shared with other tests of the module and deleted at session end,
+    unless a failed run's persisted checkpoint still points to it.
+    """
+    logger.info(f"🚀 Starting {module} test workflow")
+    checkpoint = Checkpoint.load(module)
+
+    with step("login", module=module):
+        if reuse_session:
+            open_module(page, module)
+        else:
+            login(page, module)
+    if documents is not None:
+        file_id = documents.get(page, module, checkpoint)
+        checkpoint.mark_file(file_id, ready=True)
+    else:
+        file_id = upload_and_process(page, module, checkpoint)
+    succeeded = False
     try:
-        submit_and_verify(page, module, submodules)
+        submit_and_verify(page, module, submodules, checkpoint)
+        succeeded = True
     finally:
-        # Always delete the uploaded file: a leftover output.pdf poisons the
-        # next run (same-name uploads are silently dropped by the app).
-        cleanup_file(page, module, file_id)
+        if documents is not None:
+            if succeeded:
+                checkpoint.clear()
+                documents.kept.discard(module)
+            elif checkpoint.persist:
+                documents.keep(module)
+        elif succeeded or not checkpoint.persist:
+            # Always delete the uploaded file: a leftover output.pdf poisons
+            # the next run (same-name uploads are silently dropped by the app).
+            with step("cleanup", module=module):
+                cleanup_file(page, module, file_id)
+            checkpoint.clear()
+        else:
+            # The resumed run reuses it; delete_leftover_uploads removes it
+            # if the checkpoint is abandoned instead.
+            logger.info(f"Keeping file {file_id} for resume ({checkpoint.path})")
 
     logger.info("🎉 Test execution completed!")
 
@@ -243,116 +459,316 @@ def per_component_textarea(
     module: str,
     submodules: dict[str, list[str]],
     sample_text: str = "Sample text for testing.",
+    reuse_session: bool = False,
 ) -> None:
     """Test flow for textarea-input modules (review)."""
     logger.info(f"🚀 Starting {module} test workflow (textarea mode)")
+    checkpoint = Checkpoint.load(module)
 
-    login(page, module)
+    with step("login", module=module):
+        if reuse_session:
+            open_module(page, module)
+        else:
+            login(page, module)
 
     # Fill textareas with sample text
     logger.info("Step 2: Filling textareas with sample text")
-    textareas = page.locator("textarea")
-    count = textareas.count()
-    logger.info(f"Found {count} textareas")
-    for i in range(count):
-        textareas.nth(i).click()
-        textareas.nth(i).fill(sample_text)
-        textareas.nth(i).dispatch_event("input")
-        textareas.nth(i).dispatch_event("change")
-    page.screenshot(path=f"screenshots/{module}_03_textareas_filled.png")
+    with step("fill", module=module):
+        textareas = page.locator("textarea")
+        count = textareas.count()
+        logger.info(f"Found {count} textareas")
+        for i in range(count):
+            textareas.nth(i).click()
+            textareas.nth(i).fill(sample_text)
+            textareas.nth(i).dispatch_event("input")
+            textareas.nth(i).dispatch_event("change")
+    screenshot(page, f"screenshots/{module}_03_textareas_filled.png")
     logger.info("✓ Textareas filled")
 
-    submit_and_verify(page, module, submodules)
+    submit_and_verify(page, module, submodules, checkpoint)
+    checkpoint.clear()
 
     logger.info("🎉 Test execution completed!")
 
 
-def test_draft(page) -> None:
+def benchmark_review(
+    page, words: int, submodules: dict[str, list[str]], module: str = "review"
+) -> dict:
+    """Fill every textarea with a ``words``-word narrative and time each section.
+
+    Returns (and writes to metrics/review-scaling/) the seconds from Submit
+    until each ``#main-content-review_*`` section showed content.
+    """
+    logger.info(f"📏 Review scaling benchmark: {words} words per textarea")
+    with step("login", module=module):
+        login(page, module)
+
+    with step("fill", module=module, words=words):
+        texts = [generate_narrative(words, seed=i) for i in range(8)]
+        count = fill_textareas(page, texts)
+    logger.info(f"✓ Filled {count} textareas with {words} words each")
+    screenshot(page, f"screenshots/{module}_03_benchmark_{words}_filled.png")
+
+    section_ids = [
+        f"main-content-{module}_{submod}_{subsubmod}"
+        for submod, subsubmods in submodules.items()
+        for subsubmod in subsubmods
+    ]
+    watch_sections(page, section_ids)
+    submit(page, module)
+    with step("generate", module=module, words=words):
+        completed = wait_for_sections(
+            page, len(section_ids), GENERATE_WAIT_TIMEOUT * 60 * 1000
+        )
+    times = section_times(page)
+    screenshot(page, f"screenshots/{module}_benchmark_{words}_generated.png")
+
+    result = {
+        "module": module,
+        "words_per_textarea": words,
+        "textareas": count,
+        "total_words": words * count,
+        "completed": completed,
+        "sections": {
+            sid.removeprefix("main-content-"): times.get(sid) for sid in section_ids
+        },
+        "all_sections_s": max(times.values()) if completed and times else None,
+    }
+    write_metrics("review-scaling", f"{module}_{words}_words", result)
+    for section, seconds in result["sections"].items():
+        logger.info(f"  {section}: {seconds if seconds is not None else 'timeout'}s")
+    assert completed, (
+        f"{module}: {len(section_ids) - len(times)}/{len(section_ids)} sections "
+        f"did not generate with {words} words per textarea"
+    )
+    return result
+
+
+def benchmark_uploads(
+    page,
+    module: str,
+    count: int,
+    mode: str = UPLOAD_BENCHMARK_MODE,
+    stagger: float = UPLOAD_BENCHMARK_STAGGER,
+) -> dict:
+    """Upload ``count`` uniquely named documents at once and time each one to Ready.
+
+    Returns (and writes to metrics/upload-concurrency/) per-file queueing and
+    processing times plus makespan and throughput. Every uploaded file is
+    deleted afterwards.
+    """
+    logger.info(f"📦 Upload benchmark: {count} files into {module} ({mode})")
+    with step("login", module=module):
+        login(page, module)
+    wait_for_files_list(page)
+
+    tag = f"bench_{mode}_{count}"
+    copies = make_copies("output.pdf", count, "upload-benchmark", tag)
+    for copy in copies:
+        delete_leftover_uploads(page, module, copy.name)
+    files_before = set(get_module_files(page, module))
+    file_input = page.locator("#file-upload")
+    if mode == "batch" and count > 1 and not file_input.evaluate("el => el.multiple"):
+        logger.warning("File input accepts one file at a time, uploading back to back")
+        mode, stagger = "staggered", 0
+
+    timelines: dict[str, StatusTimeline] = {}
+    upload_times: dict[str, float] = {}
+
+    def register_new_files() -> None:
+        for file_id, entry in get_module_files(page, module).items():
+            if file_id in files_before or file_id in timelines:
+                continue
+            name = (entry.get("data") or {}).get("original_file_name") or ""
+            uploaded_at = upload_times.get(name.lower(), started_at)
+            # Own label, so concurrent uploads don't skew the module's stage medians
+            timelines[file_id] = StatusTimeline(
+                page, f"{module} x{count}", file_id, uploaded_at=uploaded_at
+            )
+
+    started_at = time.time()
+    with step("upload", module=module, files=count, mode=mode):
+        if mode == "batch":
+            for copy in copies:
+                upload_times[copy.name.lower()] = started_at
+            file_input.set_input_files([str(c) for c in copies])
+        else:
+            for i, copy in enumerate(copies):
+                if i and stagger:
+                    time.sleep(stagger)
+                upload_times[copy.name.lower()] = time.time()
+                file_input.set_input_files(str(copy))
+                register_new_files()
+        deadline = time.time() + 60
+        while len(timelines) < count and time.time() < deadline:
+            register_new_files()
+            time.sleep(0.25)
+    screenshot(page, f"screenshots/{module}_03_benchmark_{count}_files_uploaded.png")
+    logger.info(f"✓ {len(timelines)}/{count} uploads registered")
+
+    finished_at = None
+    try:
+        with step("processing", module=module, files=count):
+            deadline = time.time() + UPLOAD_WAIT_TIMEOUT * 60 * max(1, count)
+            pending = dict(timelines)
+            while pending and time.time() < deadline:
+                for file_id, timeline in list(pending.items()):
+                    timeline.poll()
+                    status = timeline.current or ""
+                    if "Ready" in status:
+                        timeline.finish("ready")
+                    elif "Error" in status or "Failed" in status:
+                        timeline.finish("failed")
+                    else:
+                        continue
+                    del pending[file_id]
+                    logger.info(
+                        f"{file_id}: {status} ({len(timelines) - len(pending)}/{count})"
+                    )
+                if pending:
+                    time.sleep(STATUS_POLL_INTERVAL)
+            for timeline in pending.values():
+                timeline.finish("timeout")
+        ready_at = [
+            t.transitions[-1]["at"] / 1000
+            for t in timelines.values()
+            if t.outcome == "ready"
+        ]
+        finished_at = max(ready_at) if ready_at else None
+        screenshot(
+            page, f"screenshots/{module}_04_benchmark_{count}_files_processed.png"
+        )
+    finally:
+        with step("cleanup", module=module):
+            for file_id in timelines:
+                cleanup_file(page, module, file_id)
+
+    files = [file_metrics(t.to_dict()) for t in timelines.values()]
+    result = {
+        "module": module,
+        "mode": mode,
+        "stagger_s": stagger if mode == "staggered" else 0,
+        "files": count,
+        "registered": len(timelines),
+        **summarize(files, started_at, finished_at),
+        "per_file": files,
+    }
+    write_metrics("upload-concurrency", f"{module}_{mode}_{count}_files", result)
+    logger.info(
+        f"  {result['ready']}/{count} ready, queue p50 {result['queue_p50_s']}s, "
+        f"processing p50 {result['processing_p50_s']}s, "
+        f"makespan {result['makespan_s']}s, "
+        f"{result['throughput_per_min']} files/min"
+    )
+    assert (
+        result["ready"] == count
+    ), f"{module}: only {result['ready']}/{count} uploads reached Ready"
+    return result
+
+
+DRAFT_SUBMODULES = {
+    "questions": ["q_1", "q_2", "q_3", "q_4", "q_5", "q_6"],
+}
+
+REVIEW_SUBMODULES = {
+    "eligibility": [
+        "overall_eligibility",
+        "baseline_statements",
+        "internet_search",
+        "feedback",
+        "uncertainty_check",
+        "qualifying_activity",
+        "risk_factors",
+    ],
+    "baseline": ["comprehensiveness", "focus", "phrasing", "grammar"],
+    "advance": [
+        "comprehensiveness",
+        "focus",
+        "phrasing",
+        "guideline_references",
+        "grammar",
+    ],
+    "uncertainty": [
+        "comprehensiveness",
+        "focus",
+        "phrasing",
+        "guideline_references",
+        "grammar",
+    ],
+    "resolution": [
+        "comprehensiveness",
+        "focus",
+        "phrasing",
+        "guideline_references",
+        "grammar",
+    ],
+    "overall": ["coherence", "competent_professionals"],
+    "questions_for_client": [
+        "research",
+        "risk_factors",
+        "narrative_content_coverage",
+    ],
+}
+
+QUALIFY_SUBMODULES = {
+    "eligibility": [
+        "summary",
+        "baseline_statements",
+        "internet_search",
+        "feedback",
+        "uncertainty_check",
+        "qualifying_activity",
+        "risk_factors",
+    ],
+    "narrative_content_coverage": [
+        "baseline",
+        "advance",
+        "uncertainty",
+        "resolution",
+    ],
+    "questions_for_client": [
+        "research",
+        "risk_factors",
+        "narrative_content_coverage",
+    ],
+}
+
+
+def test_draft(page, processed_documents) -> None:
     per_component(
         page,
         module="draft",
-        submodules={
-            "questions": ["q_1", "q_2", "q_3", "q_4", "q_5", "q_6"],
-        },
+        submodules=DRAFT_SUBMODULES,
+        documents=processed_documents,
     )
 
 
 def test_review(page) -> None:
-    review_submodules = {
-        "eligibility": [
-            "overall_eligibility",
-            "baseline_statements",
-            "internet_search",
-            "feedback",
-            "uncertainty_check",
-            "qualifying_activity",
-            "risk_factors",
-        ],
-        "baseline": ["comprehensiveness", "focus", "phrasing", "grammar"],
-        "advance": [
-            "comprehensiveness",
-            "focus",
-            "phrasing",
-            "guideline_references",
-            "grammar",
-        ],
-        "uncertainty": [
-            "comprehensiveness",
-            "focus",
-            "phrasing",
-            "guideline_references",
-            "grammar",
-        ],
-        "resolution": [
-            "comprehensiveness",
-            "focus",
-            "phrasing",
-            "guideline_references",
-            "grammar",
-        ],
-        "overall": ["coherence", "competent_professionals"],
-        "questions_for_client": [
-            "research",
-            "risk_factors",
-            "narrative_content_coverage",
-        ],
-    }
+    per_component_textarea(page, module="review", submodules=REVIEW_SUBMODULES)
 
-    per_component_textarea(
-        page,
-        module="review",
-        submodules=review_submodules,
-    )
 
+@pytest.mark.skipif(
+    not REVIEW_BENCHMARK, reason="set REVIEW_BENCHMARK=1 to run the scaling benchmark"
+)
+@pytest.mark.parametrize("words", REVIEW_BENCHMARK_WORDS)
+def test_review_scaling(page, words) -> None:
+    benchmark_review(page, words, submodules=REVIEW_SUBMODULES)
+
+
+@pytest.mark.skipif(
+    not UPLOAD_BENCHMARK, reason="set UPLOAD_BENCHMARK=1 to run the upload benchmark"
+)
+@pytest.mark.parametrize("files", UPLOAD_BENCHMARK_FILES)
+def test_upload_concurrency(page, files) -> None:
+    benchmark_uploads(page, UPLOAD_BENCHMARK_MODULE, files)
 
-def test_qualify(page) -> None:
-    submodules = {
-        "eligibility": [
-            "summary",
-            "baseline_statements",
-            "internet_search",
-            "feedback",
-            "uncertainty_check",
-            "qualifying_activity",
-            "risk_factors",
-        ],
-        "narrative_content_coverage": [
-            "baseline",
-            "advance",
-            "uncertainty",
-            "resolution",
-        ],
-        "questions_for_client": [
-            "research",
-            "risk_factors",
-            "narrative_content_coverage",
-        ],
-    }
 
+def test_qualify(page, processed_documents) -> None:
     per_component(
         page,
         module="qualify",
-        submodules=submodules,
+        submodules=QUALIFY_SUBMODULES,
+        documents=processed_documents,
     )
 
 
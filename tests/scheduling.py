@@ -0,0 +1,167 @@
+"""Duration-aware test ordering and sharding (pytest plugin).
+
+Tests are ordered longest-first using their median duration over the
+dashboard's run history (``_site/report-history.json``; the CI workflow
+restores it before the tests run). Tests are keyed by node id (stored in the
+history in JUnit form, ``tests.run::test_draft``), so same-named tests in
+different modules or classes are told apart. Tests without history are
+estimated at the median of the known ones.
+
+With ``--shard-count N --shard-index I`` the collected tests are bin-packed
+over N workers with the longest-processing-time rule (each test goes to the
+currently least-loaded shard), and only shard I's tests run. Start one
+pytest per shard to run them in parallel. ``--flaky-first`` moves tests
+that both passed and failed in recent history to the front, so their
+failures surface early.
+
+    pytest tests/run.py --shard-count 3 --shard-index 0
+    pytest tests/run.py --schedule=file   # plain file order
+"""
+
+import json
+import logging
+import os
+import re
+import statistics
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FILE = os.getenv("TEST_HISTORY_FILE", "_site/report-history.json")
+HISTORY_RUNS = 10  # recent runs used for estimates
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("scheduling", "duration-aware scheduling")
+    group.addoption(
+        "--schedule",
+        choices=("duration", "file"),
+        default="duration",
+        help="order tests longest-first from run history (default) or keep file order",
+    )
+    group.addoption(
+        "--shard-count", type=int, default=1, help="split the tests over N shards"
+    )
+    group.addoption("--shard-index", type=int, default=0, help="shard to run (0-based)")
+    group.addoption(
+        "--flaky-first", action="store_true", help="run recently flaky tests first"
+    )
+
+
+def junit_id(nodeid: str) -> str:
+    """JUnit-style id of a node, as stored in the history.
+
+    ``tests/run.py::TestX::test_y[p]`` -> ``tests.run.TestX::test_y[p]``
+    """
+    path, bracket, params = nodeid.partition("[")
+    names = path.split("::")
+    names[0] = re.sub(r"\.py$", "", names[0].replace("/", "."))
+    return ".".join(names[:-1]) + "::" + names[-1] + bracket + params
+
+
+def load_test_history(
+    path: str = HISTORY_FILE, runs: int = HISTORY_RUNS
+) -> dict[str, list[dict]]:
+    """{test id: [{"duration", "result"}, ...]} from this environment's last runs.
+
+    Entries recorded before ids were stored are keyed by bare test name.
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            history = json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable history {path}: {e}")
+        return {}
+
+    environment = os.getenv("TEST_ENVIRONMENT") or "default"
+    results: dict[str, list[dict]] = {}
+    same_env = [
+        h for h in history if (h.get("environment") or "default") == environment
+    ]
+    for run in same_env[:runs]:
+        for t in run.get("tests", []):
+            results.setdefault(t.get("id") or t["name"], []).append(
+                {"duration": t.get("duration") or 0, "result": t.get("result")}
+            )
+    return results
+
+
+def estimate_durations(
+    names: list[str], history: dict[str, list[dict]]
+) -> dict[str, float]:
+    """Median passed (else any) duration per test; unknown tests get the overall one."""
+    known = {}
+    for name in names:
+        runs = history.get(name, [])
+        passed = [r["duration"] for r in runs if r["result"] == "passed"]
+        durations = passed or [r["duration"] for r in runs]
+        if durations:
+            known[name] = statistics.median(durations)
+    default = statistics.median(known.values()) if known else 0.0
+    return {name: known.get(name, default) for name in names}
+
+
+def is_flaky(runs: list[dict]) -> bool:
+    results = {r["result"] for r in runs}
+    return "passed" in results and bool(results & {"failed", "error"})
+
+
+def assign_shards(durations: dict[str, float], shard_count: int) -> list[list[str]]:
+    """Longest-processing-time bin packing.
+
+    Each test, longest first, goes to the currently lightest shard.
+    """
+    shards: list[list[str]] = [[] for _ in range(shard_count)]
+    loads = [0.0] * shard_count
+    for name in sorted(durations, key=durations.get, reverse=True):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(name)
+        loads[lightest] += durations[name]
+    return shards
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    if config.getoption("schedule") == "file" and config.getoption("shard_count") <= 1:
+        return
+    shard_count = config.getoption("shard_count")
+    shard_index = config.getoption("shard_index")
+    if not 0 <= shard_index < shard_count:
+        raise pytest.UsageError(f"--shard-index must be in 0..{shard_count - 1}")
+
+    history = load_test_history()
+    # Node ids keep same-named tests apart; bare names cover older history
+    runs = {
+        item.nodeid: history.get(junit_id(item.nodeid)) or history.get(item.name, [])
+        for item in items
+    }
+    ids = list(runs)
+    durations = estimate_durations(ids, runs)
+
+    if config.getoption("schedule") == "duration":
+        flaky = set()
+        if config.getoption("flaky_first"):
+            flaky = {nodeid for nodeid in ids if is_flaky(runs[nodeid])}
+        # Stable sort: ties keep file order
+        items.sort(key=lambda item: (item.nodeid not in flaky, -durations[item.nodeid]))
+
+    if shard_count > 1:
+        shards = assign_shards(durations, shard_count)
+        selected = set(shards[shard_index])
+        deselected = [item for item in items if item.nodeid not in selected]
+        items[:] = [item for item in items if item.nodeid in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        loads = [sum(durations[n] for n in shard) for shard in shards]
+        logger.info(
+            f"Shard {shard_index + 1}/{shard_count}: {len(items)} tests, "
+            f"~{loads[shard_index]:.0f}s (makespan ~{max(loads):.0f}s)"
+        )
+
+    logger.info(
+        "Test order: "
+        + ", ".join(f"{item.name} (~{durations[item.nodeid]:.0f}s)" for item in items)
+    )
@@ -0,0 +1,144 @@
+"""Processing-status timeline for uploaded files.
+
+A MutationObserver installed in the page records every change of the file's
+``#status-cell-{file_id}`` text with a millisecond timestamp, so the test sees
+each server-side stage (and how long it took) instead of whatever a periodic
+sample happens to catch. Timestamps are epoch milliseconds on both sides so
+the Python-side upload/registration marks line up with the in-page ones.
+"""
+
+import logging
+import time
+
+from tests import events
+
+logger = logging.getLogger(__name__)
+
+# The observer watches the whole body because the files table re-renders rows
+# (replacing the status cell) as the app's state changes.
+OBSERVER_SCRIPT = """
+(fileId) => {
+  const timelines = window.__statusTimelines = window.__statusTimelines || {};
+  if (timelines[fileId]) return;
+  const timeline = timelines[fileId] = [];
+  const now = () => performance.timeOrigin + performance.now();
+  const check = () => {
+    const cell = document.getElementById(`status-cell-${fileId}`);
+    const status = cell ? cell.textContent.trim() : null;
+    const last = timeline.length ? timeline[timeline.length - 1].status : undefined;
+    if (status && status !== last) timeline.push({status, at: now()});
+  };
+  check();
+  new MutationObserver(check).observe(document.body, {
+    childList: true, subtree: true, characterData: true,
+  });
+}
+"""
+
+# Timelines started on each page, keyed by id(page)
+_timelines: dict[int, list["StatusTimeline"]] = {}
+
+
+class StatusTimeline:
+    """Status transitions of one uploaded file, from upload to a final status."""
+
+    def __init__(
+        self,
+        page,
+        module: str,
+        file_id: str,
+        uploaded_at: float,
+        registered_at: float | None = None,
+    ):
+        self.page = page
+        self.module = module
+        self.file_id = file_id
+        self.uploaded_at = uploaded_at * 1000
+        # When the id first showed up in the app state; defaults to now
+        self.registered_at = (registered_at or time.time()) * 1000
+        self.transitions: list[dict] = []
+        self.outcome = "pending"
+        self.finished_at: float | None = None
+        page.evaluate(OBSERVER_SCRIPT, file_id)
+        _timelines.setdefault(id(page), []).append(self)
+
+    def poll(self) -> list[dict]:
+        """Fetch transitions observed so far and return the new ones."""
+        observed = self.page.evaluate(
+            "(id) => (window.__statusTimelines || {})[id] || []", self.file_id
+        )
+        new = observed[len(self.transitions) :]
+        self.transitions = observed
+        for transition in new:
+            events.publish(
+                "status",
+                module=self.module,
+                file_id=self.file_id,
+                status=transition["status"],
+                at=round(transition["at"] / 1000, 3),
+            )
+        return new
+
+    def finish(self, outcome: str) -> None:
+        """Mark the wait as over: ``ready``, ``failed`` or ``timeout``."""
+        self.outcome = outcome
+        self.finished_at = time.time() * 1000
+
+    @property
+    def current(self) -> str | None:
+        return self.transitions[-1]["status"] if self.transitions else None
+
+    def stages(self) -> list[dict]:
+        """Time spent in each stage: registration, then every observed status.
+
+        A final Ready/Error status ends the timeline; any other last status
+        was still in progress when the wait ended and is timed up to then.
+        """
+        stages = [
+            {
+                "stage": "registration",
+                "start": self.uploaded_at,
+                "duration_ms": round(self.registered_at - self.uploaded_at, 1),
+            }
+        ]
+        for current, following in zip(self.transitions, self.transitions[1:]):
+            stages.append(
+                {
+                    "stage": current["status"],
+                    "start": current["at"],
+                    "duration_ms": round(following["at"] - current["at"], 1),
+                }
+            )
+        if self.transitions and self.outcome not in ("ready", "failed"):
+            last = self.transitions[-1]
+            end = self.finished_at or time.time() * 1000
+            stages.append(
+                {
+                    "stage": last["status"],
+                    "start": last["at"],
+                    "duration_ms": round(end - last["at"], 1),
+                    "in_progress": True,
+                }
+            )
+        return stages
+
+    def to_dict(self) -> dict:
+        if self.outcome in ("ready", "failed") and self.transitions:
+            end = self.transitions[-1]["at"]
+        else:
+            end = self.finished_at or time.time() * 1000
+        return {
+            "module": self.module,
+            "file_id": self.file_id,
+            "outcome": self.outcome,
+            "uploaded_at": self.uploaded_at,
+            "registered_at": self.registered_at,
+            "transitions": self.transitions,
+            "stages": self.stages(),
+            "total_ms": round(end - self.uploaded_at, 1),
+        }
+
+
+def detach(page) -> list[dict]:
+    """Return the timelines recorded on ``page`` and forget them."""
+    return [t.to_dict() for t in _timelines.pop(id(page), [])]
@@ -0,0 +1,59 @@
+"""Named, timed steps of the test flows.
+
+Flows wrap each stage (login, upload, processing, submit, generation, ...) in
+:func:`step`. Every finished step is kept until the next :func:`drain` (the
+conftest writes them per test) and passed to any registered listener, which
+is how the monitor builds its per-stage latency histograms.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_records: list[dict] = []
+_listeners: list[Callable[[str, dict], None]] = []
+
+
+def add_listener(listener: Callable[[str, dict], None]) -> None:
+    """Call ``listener(event, record)`` on every step ``start`` and ``end``."""
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[str, dict], None]) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _notify(event: str, record: dict) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(event, record)
+        except Exception as e:
+            logger.warning(f"Step listener failed: {e}")
+
+
+@contextmanager
+def step(name: str, **fields):
+    """Time the wrapped block as step ``name``; extra fields are recorded as-is."""
+    record = {"step": name, **fields, "start": time.time(), "status": "running"}
+    _notify("start", record)
+    try:
+        yield record
+        record["status"] = "passed"
+    except BaseException:
+        record["status"] = "failed"
+        raise
+    finally:
+        record["duration"] = round(time.time() - record["start"], 3)
+        _records.append(record)
+        _notify("end", record)
+
+
+def drain() -> list[dict]:
+    """Return the steps finished since the last call and forget them."""
+    records = list(_records)
+    _records.clear()
+    return records
@@ -0,0 +1,33 @@
+"""Unit tests for endpoint normalisation in :mod:`tests.network_metrics`."""
+
+import pytest
+
+from tests.network_metrics import normalize_endpoint
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://host/api/files/123?x=1", "GET host/api/files/{id}"),
+        (
+            "https://host/api/claims/0f8fad5b-d9cb-469f-a165-70867728950e/files",
+            "GET host/api/claims/{id}/files",
+        ),
+        ("https://host/api/blobs/5f2b9c0e8d7a6b4c3e2f1a09", "GET host/api/blobs/{id}"),
+        (
+            "https://host/api/share/aB3dEf9hIjKlMnOpQrStUvWx12",
+            "GET host/api/share/{id}",
+        ),
+        # Long words are endpoints, not ids
+        (
+            "https://host/api/narrative_content_coverage",
+            "GET host/api/narrative_content_coverage",
+        ),
+        (
+            "https://host/api/medical-records-summary-export",
+            "GET host/api/medical-records-summary-export",
+        ),
+    ],
+)
+def test_normalize_endpoint(url, expected):
+    assert normalize_endpoint("GET", url) == expected
@@ -0,0 +1,81 @@
+"""Helpers for the concurrent multi-file upload benchmark.
+
+- :func:`make_copies` creates uniquely named copies of the test document
+  (the app silently drops uploads whose name already exists in the module).
+- :func:`file_metrics` splits each file's status timeline into queueing
+  (until the first status that isn't a waiting one) and processing (from
+  there until Ready).
+- :func:`summarize` aggregates one benchmark run: per-file percentiles,
+  makespan and throughput.
+"""
+
+import re
+import shutil
+from pathlib import Path
+
+from tests.metrics import percentile
+
+# Statuses a file shows while it waits for a processing slot
+WAITING_STATUS = re.compile(r"upload|pending|queue|wait", re.IGNORECASE)
+
+
+def make_copies(source: str, count: int, directory: str, tag: str) -> list[Path]:
+    """``count`` copies of ``source`` named ``<tag>_<i><suffix>`` in ``directory``."""
+    src = Path(source)
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    copies = []
+    for i in range(1, count + 1):
+        target = out / f"{tag}_{i:02d}{src.suffix}"
+        shutil.copyfile(src, target)
+        copies.append(target)
+    return copies
+
+
+def file_metrics(timeline: dict) -> dict:
+    """Queueing, processing and total seconds of one file's status timeline."""
+    uploaded = timeline["uploaded_at"]
+    transitions = timeline.get("transitions", [])
+    started = next(
+        (t["at"] for t in transitions if not WAITING_STATUS.search(t["status"])),
+        None,
+    )
+    ready = (
+        transitions[-1]["at"]
+        if timeline.get("outcome") == "ready" and transitions
+        else None
+    )
+
+    def seconds(start, end):
+        return (
+            round((end - start) / 1000, 2)
+            if start is not None and end is not None
+            else None
+        )
+
+    return {
+        "file_id": timeline["file_id"],
+        "outcome": timeline.get("outcome"),
+        "registration_s": seconds(uploaded, timeline.get("registered_at")),
+        "queue_s": seconds(uploaded, started),
+        "processing_s": seconds(started, ready),
+        "total_s": seconds(uploaded, ready),
+    }
+
+
+def summarize(files: list[dict], started_at: float, finished_at: float | None) -> dict:
+    """Aggregate per-file metrics; times are epoch seconds."""
+    ready = [f for f in files if f["outcome"] == "ready"]
+    makespan = round(finished_at - started_at, 2) if finished_at and ready else None
+    summary = {
+        "ready": len(ready),
+        "makespan_s": makespan,
+        "throughput_per_min": (
+            round(len(ready) / makespan * 60, 2) if makespan else None
+        ),
+    }
+    for key in ("queue_s", "processing_s", "total_s"):
+        values = [f[key] for f in files]
+        summary[f"{key.removesuffix('_s')}_p50_s"] = percentile(values, 50)
+        summary[f"{key.removesuffix('_s')}_max_s"] = percentile(values, 100)
+    return summary